@@ -0,0 +1,40 @@
+"""Print the header row and first few data rows of an order workbook.
+
+Only the rows that are printed get parsed: the workbook is opened in
+openpyxl read-only mode and walked lazily with iter_rows, so checking the
+columns of a large export is near-instant.
+
+Usage: python scripts/check_columns.py path/to/orders.xlsx [rows]
+"""
+import sys
+from itertools import islice
+
+from openpyxl import load_workbook
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+
+    path = sys.argv[1]
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, ())
+
+        print(f"Columns in {path}:")
+        for i, col in enumerate(header, 1):
+            print(f"  {i:>3}. {col}")
+
+        print(f"\nFirst {n_rows} rows:")
+        for row in islice(rows, n_rows):
+            print(f"  {row}")
+    finally:
+        wb.close()
+
+
+if __name__ == "__main__":
+    main()
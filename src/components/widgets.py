@@ -15,8 +15,12 @@ def section_card(title: str, help_text: str = ""):
 
 
 def render_file_summary(
-    uploaded_file, df: pd.DataFrame | None, required_columns: list[str]
+    uploaded_file,
+    df: pd.DataFrame | None,
+    required_columns: list[str],
+    row_count: int | str | None = None,
 ):
+    """Upload summary card; pass ``row_count`` when ``df`` is only a preview."""
     if not uploaded_file:
         st.info("No file uploaded yet.")
         return False
@@ -27,7 +31,7 @@ def render_file_summary(
         return False
 
     c1, c2, c3 = st.columns(3)
-    c1.metric("Rows", len(df))
+    c1.metric("Rows", len(df) if row_count is None else row_count)
     c2.metric("Columns", len(df.columns))
     c3.metric("Required", len(required_columns))
 
@@ -9,6 +9,8 @@ from typing import Dict, Tuple, Optional
 import pandas as pd
 from fuzzywuzzy import process
 
+from src.utils.file_io import read_excel
+
 
 @lru_cache(maxsize=4096)
 def normalize_key(val) -> str:
@@ -27,12 +29,15 @@ def normalize_key(val) -> str:
     return s
 
 
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9]")
+
+
 @lru_cache(maxsize=4096)
 def normalize_sku(val) -> str:
     """Corrects typos and extra spaces in SKUs for strict but flexible matching."""
     s = normalize_key(val)
     # Remove all spaces and special characters for 'hard' matching, but keep it roughly same
-    s = re.sub(r"[^a-zA-Z0-9]", "", s).upper()
+    s = _NON_ALNUM_RE.sub("", s).upper()
     return s
 
 
@@ -152,18 +157,16 @@ def add_title_size_column(
     df: pd.DataFrame, title_col: str, size_col: Optional[str]
 ) -> pd.DataFrame:
     """Add a 'Title - Size' column to an inventory dataframe."""
-
-    def _joined(r):
-        title = normalize_key(r.get(title_col, ""))
-        size = "NO_SIZE"
-        if size_col and size_col in df.columns:
-            size = normalize_size(r.get(size_col, ""))
-        if title and size and size != "NO_SIZE":
-            return f"{title} - {size}"
-        return title
-
     df = df.copy()
-    df["Title - Size"] = df.apply(_joined, axis=1)
+    if title_col in df.columns:
+        titles = df[title_col].map(normalize_key).astype(str)
+    else:
+        titles = pd.Series("", index=df.index, dtype=str)
+    if size_col and size_col in df.columns:
+        sizes = df[size_col].map(normalize_size).astype(str)
+        sized = (titles != "") & (sizes != "NO_SIZE")
+        titles = titles.where(~sized, titles + " - " + sizes)
+    df["Title - Size"] = titles
     return df
 
 
@@ -173,7 +176,7 @@ def _read_uploaded(file_obj) -> pd.DataFrame:
     file_obj.seek(0)
     if getattr(file_obj, "name", "").endswith(".csv"):
         return pd.read_csv(file_obj)
-    return pd.read_excel(file_obj)
+    return read_excel(file_obj)
 
 
 def load_inventory_from_uploads(uploaded_files: Dict[str, object]):
@@ -20,6 +20,22 @@ def _get_category(name: str) -> str:
     return get_category_for_sales(name)
 
 
+def _map_distinct(values: pd.Series, func) -> pd.Series:
+    """``values.apply(func)``, calling ``func`` once per distinct value.
+
+    Item names repeat on every order line, and each ``_get_category`` call
+    goes through st.cache_data's argument hashing. Blank cells are passed to
+    ``func`` as they are, since None and NaN can't share one mapping key.
+    """
+    present = values.notna()
+    uniq = pd.unique(values[present])
+    mapping = {v: func(v) for v in uniq}
+    mapped = values.map(mapping).astype(object)
+    if not present.all():
+        mapped[~present] = [func(v) for v in values[~present]]
+    return mapped
+
+
 def render_ingestion_filters(
     granular_df: pd.DataFrame | None,
     dummy_mapping: dict,
@@ -154,10 +170,11 @@ def render_ingestion_filters(
                             df_res = wc_res["df_to_return"]
                             if not df_res.empty:
                                 if sel_unified:
-                                    df_res["_TmpCat"] = df_res["Item Name"].apply(_get_category)
-                                    df_res["_TmpSub"] = df_res.apply(
-                                        lambda r: get_sub_category_for_sales(r["Item Name"], r["_TmpCat"]), axis=1
-                                    )
+                                    df_res["_TmpCat"] = _map_distinct(df_res["Item Name"], _get_category)
+                                    df_res["_TmpSub"] = [
+                                        get_sub_category_for_sales(name, cat)
+                                        for name, cat in zip(df_res["Item Name"], df_res["_TmpCat"])
+                                    ]
                                     mask = pd.Series(False, index=df_res.index)
                                     for opt in sel_unified:
                                         if "  \u21b3 " in opt:
@@ -172,12 +189,14 @@ def render_ingestion_filters(
                                         df_res = df_res.drop(columns=["_TmpSub"])
 
                                 if sel_prods:
-                                    df_res["_TmpIdent"] = df_res.apply(
-                                        lambda r: f"{get_base_product_name(r['Item Name'])} [{r['SKU']}]", axis=1
+                                    # Same identity as Filter_Identity in process_data
+                                    df_res["_TmpIdent"] = (
+                                        df_res["Item Name"].map(get_base_product_name).astype(str)
+                                        + " [" + df_res["SKU"].astype(str) + "]"
                                     )
                                     df_res = df_res[df_res["_TmpIdent"].isin(sel_prods)].drop(columns=["_TmpIdent"])
                                 if sel_sizes:
-                                    df_res["_TmpSize"] = df_res["Item Name"].apply(get_size_from_name)
+                                    df_res["_TmpSize"] = _map_distinct(df_res["Item Name"], get_size_from_name)
                                     df_res = df_res[df_res["_TmpSize"].isin(sel_sizes)].drop(columns=["_TmpSize"])
 
                                 if not df_res.empty:
@@ -15,6 +15,7 @@ from src.pages.dashboard_filters import render_ingestion_filters
 from src.pages.dashboard_metrics import render_operational_metrics
 from src.processing.forecasting import PredictiveIntelligence
 from src.services.woocommerce.client import get_items_sold_label
+from src.utils.file_io import EXCEL_HEADER_STYLE, excel_writer, style_header_row
 from src.utils.safe_ops import safe_render
 
 
@@ -361,7 +362,7 @@ def render_dashboard_output(
         report_text = generate_executive_briefing(today_rev, today_qty, today_orders, today_aov, dm, top)
 
     buf_pbi = BytesIO()
-    with pd.ExcelWriter(buf_pbi, engine="xlsxwriter") as wr:
+    with excel_writer(buf_pbi) as wr:
         if is_operational:
             df_exec = pd.DataFrame({"Executive Summary": report_text.split('\n')})
             df_exec.to_excel(wr, sheet_name="Executive Briefing", index=False)
@@ -390,7 +391,7 @@ def render_dashboard_output(
             active_df.to_excel(wr, sheet_name="Raw Shift Data", index=False)
 
         workbook = wr.book
-        header_format = workbook.add_format({'bold': True, 'bg_color': '#4F81BD', 'font_color': 'white', 'border': 1})
+        header_format = workbook.add_format(EXCEL_HEADER_STYLE)
 
         # Auto-format column widths & apply header styles
         sheets_to_format = [
@@ -404,21 +405,11 @@ def render_dashboard_output(
             
         for sheet_name, df_ref in sheets_to_format:
             if sheet_name in wr.sheets and not df_ref.empty:
-                ws = wr.sheets[sheet_name]
-                for idx, col in enumerate(df_ref.columns):
-                    ws.write(0, idx, str(col), header_format)
-                    
-                    try:
-                        # Drop NA to avoid 'nan' skewing length, calculate actual max string length
-                        col_data = df_ref[col].dropna().astype(str)
-                        max_val_len = col_data.map(len).max() if not col_data.empty else 0
-                        # Add a +4 buffer for cell padding, bold headers, and font scaling
-                        max_len = max(max_val_len, len(str(col))) + 4
-                    except Exception:
-                        max_len = len(str(col)) + 4
-                    
-                    # Cap max width at 100 to prevent unreadably wide columns
-                    ws.set_column(idx, idx, min(max_len, 100))
+                # Add a +4 buffer for cell padding, bold headers, and font scaling;
+                # cap at 100 to prevent unreadably wide columns
+                style_header_row(
+                    wr.sheets[sheet_name], df_ref, header_format, padding=4, cap=100
+                )
 
     export_date_str = datetime.now().strftime('%Y%m%d')
     if not is_operational:
@@ -8,6 +8,7 @@ from src.config.settings import get_setting
 from src.services.llm.manager import init_llm_controller
 
 from src.utils.ml_brain import NeuralBrain
+from src.utils.file_io import read_uploaded
 from src.processing.forecasting import PredictiveIntelligence
 
 class AIDataAgent:
@@ -138,7 +139,7 @@ def render_sidebar_controls():
         up_file = st.file_uploader("Upload CSV/Excel", type=["csv", "xlsx"], key=f"pilot_up_{st.session_state.pilot_uploader_key}")
         if up_file:
             try:
-                df = pd.read_csv(up_file) if up_file.name.endswith('.csv') else pd.read_excel(up_file)
+                df = read_uploaded(up_file)
                 st.session_state.pilot_uploaded_df = df
                 st.success(f"Ingested {len(df)} records.")
             except Exception as e:
@@ -12,7 +12,12 @@ from src.components.widgets import (
 )
 from src.config.ui_config import INVENTORY_LOCATIONS
 from src.inventory import core as inv_core
-from src.utils.file_io import read_uploaded
+from src.utils.file_io import (
+    EXCEL_HEADER_STYLE,
+    excel_writer,
+    read_uploaded,
+    style_header_row,
+)
 
 
 def _reset_inventory_state():
@@ -27,6 +32,32 @@ def _render_upload_summary(master_df, title_col):
     c2.metric("Title column", title_col if title_col else "Not detected")
 
 
+def _distribution_report_bytes(df: pd.DataFrame, active_locations) -> bytes:
+    """Builds the distribution workbook; only runs when the download is clicked."""
+    output = io.BytesIO()
+    with excel_writer(output) as writer:
+        loc_totals = [{"Metric": "Total SKUs Analyzed", "Value": df.shape[0] if hasattr(df, 'shape') else len(df)}]
+        for loc in active_locations:
+            if loc in df.columns:
+                loc_totals.append({"Metric": f"Total Units ({loc})", "Value": pd.to_numeric(df[loc], errors='coerce').sum()})
+        df_metrics = pd.DataFrame(loc_totals)
+        df_metrics.to_excel(writer, index=False, sheet_name="Distribution Metrics")
+        
+        df.to_excel(writer, index=False, sheet_name="Granular Distribution")
+
+        workbook = writer.book
+        header_format = workbook.add_format(EXCEL_HEADER_STYLE)
+
+        # Auto-format column widths & apply header styles
+        for sheet_name, df_ref in [
+            ("Distribution Metrics", df_metrics),
+            ("Granular Distribution", df)
+        ]:
+            if sheet_name in writer.sheets and not df_ref.empty:
+                style_header_row(writer.sheets[sheet_name], df_ref, header_format)
+    return output.getvalue()
+
+
 def render_distribution_tab(search_q):
     render_reset_confirm("Inventory Distribution", "inventory", _reset_inventory_state)
     master_file = st.file_uploader("", type=["xlsx", "csv"], key="inv_up")
@@ -208,42 +239,9 @@ def render_distribution_tab(search_q):
 
         st.dataframe(df, use_container_width=True)
 
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-            loc_totals = [{"Metric": "Total SKUs Analyzed", "Value": df.shape[0] if hasattr(df, 'shape') else len(df)}]
-            for loc in active_locations:
-                if loc in df.columns:
-                    loc_totals.append({"Metric": f"Total Units ({loc})", "Value": pd.to_numeric(df[loc], errors='coerce').sum()})
-            df_metrics = pd.DataFrame(loc_totals)
-            df_metrics.to_excel(writer, index=False, sheet_name="Distribution Metrics")
-            
-            df.to_excel(writer, index=False, sheet_name="Granular Distribution")
-
-            workbook = writer.book
-            header_format = workbook.add_format({'bold': True, 'bg_color': '#4F81BD', 'font_color': 'white', 'border': 1})
-
-            # Auto-format column widths & apply header styles
-            for sheet_name, df_ref in [
-                ("Distribution Metrics", df_metrics),
-                ("Granular Distribution", df)
-            ]:
-                if sheet_name in writer.sheets and not df_ref.empty:
-                    ws = writer.sheets[sheet_name]
-                    for idx, col in enumerate(df_ref.columns):
-                        ws.write(0, idx, str(col), header_format)
-                        try:
-                            max_len = max(df_ref[col].astype(str).map(lambda x: len(str(x))).max(), len(str(col))) + 2
-                            ws.set_column(idx, idx, min(max_len, 50))
-                        except Exception as e:
-                            import traceback
-                            with open("h:\\DEEN-OPS\\excel_format_error.log", "a", encoding="utf-8") as f:
-                                f.write(traceback.format_exc())
-                            max_len = len(str(col)) + 2
-                            ws.set_column(idx, idx, min(max_len, 50))
-                        
         st.download_button(
             "Download distribution report",
-            output.getvalue(),
+            lambda: _distribution_report_bytes(df, active_locations),
             "Stock_Distribution.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True,
@@ -19,14 +19,22 @@ from src.config.ui_config import PATHAO_CONFIG
 from src.processing.order_processor import (
     normalize_manual_item_input,
     process_orders_dataframe,
+    reload_pathao_map,
 )
 from src.services.pathao.status import get_pathao_order_status
 from src.services.pathao.client import PathaoClient
 from src.state.persistence import clear_state_keys, save_state
-from src.utils.file_io import read_uploaded
+from src.utils.file_io import (
+    EXCEL_HEADER_STYLE,
+    excel_writer,
+    read_uploaded,
+    style_header_row,
+    write_url_column,
+)
 from src.utils.logging import log_error
 
 REQUIRED_COLUMNS = ["Phone (Billing)"]
+PREVIEW_ROWS = 50
 SOURCE_WOOCOM = "WooCommerce Processing"
 SOURCE_UPLOAD = "Upload / URL"
 
@@ -104,6 +112,7 @@ def _sync_pathao_map():
             os.makedirs("resources", exist_ok=True)
             with open("resources/pathao_map.json", "w", encoding="utf-8") as f:
                 json.dump(full_map, f, indent=4)
+            reload_pathao_map()
 
             st.success(f"Successfully synced {len(cities)} cities and their areas.")
             status.update(label="Sync complete", state="complete")
@@ -242,11 +251,14 @@ def _render_processing_tab():
             st.error(f"Failed to fetch data: {exc}")
     elif uploaded_file:
         try:
-            preview_df = read_uploaded(uploaded_file)
-            st.session_state.pathao_preview_df = preview_df
-            st.session_state.pathao_preview_source = source_mode
+            # Validation and the preview only need the first rows; the full
+            # sheet is parsed once processing starts.
+            preview_df = read_uploaded(uploaded_file, nrows=PREVIEW_ROWS)
             valid_file = render_file_summary(
-                uploaded_file, preview_df, REQUIRED_COLUMNS
+                uploaded_file,
+                preview_df,
+                REQUIRED_COLUMNS,
+                row_count=f"{PREVIEW_ROWS}+" if len(preview_df) == PREVIEW_ROWS else None,
             )
         except Exception as exc:
             log_error(exc, context="Pathao Upload")
@@ -261,7 +273,7 @@ def _render_processing_tab():
 
     if preview_df is not None:
         with st.expander("Preview source data", expanded=False):
-            st.dataframe(preview_df.head(50), use_container_width=True)
+            st.dataframe(preview_df.head(PREVIEW_ROWS), use_container_width=True)
 
     run_clicked, clear_clicked = render_action_bar(
         primary_label="Process orders",
@@ -284,6 +296,10 @@ def _render_processing_tab():
         else:
             try:
                 with st.status("Processing orders...", expanded=True) as status:
+                    if uploaded_file:
+                        preview_df = read_uploaded(uploaded_file)
+                        st.session_state.pathao_preview_df = preview_df
+                        st.session_state.pathao_preview_source = source_mode
                     st.write("Applying cleanup, district resolution, and address normalization...")
                     result_df = process_orders_dataframe(preview_df)
                     st.session_state.pathao_res_df = result_df
@@ -304,23 +320,12 @@ def _render_processing_tab():
         c1, c2 = st.columns(2)
         with c1:
             buf_pathao = BytesIO()
-            with pd.ExcelWriter(buf_pathao, engine="xlsxwriter") as writer:
+            with excel_writer(buf_pathao) as writer:
                 result_df.to_excel(writer, sheet_name="Pathao", index=False)
                 workbook = writer.book
-                header_format = workbook.add_format(
-                    {
-                        "bold": True,
-                        "bg_color": "#4F81BD",
-                        "font_color": "white",
-                        "border": 1,
-                    }
-                )
+                header_format = workbook.add_format(EXCEL_HEADER_STYLE)
 
-                ws = writer.sheets["Pathao"]
-                for idx, col in enumerate(result_df.columns):
-                    ws.write(0, idx, str(col), header_format)
-                    max_len = max(result_df[col].astype(str).map(len).max(), len(str(col))) + 2
-                    ws.set_column(idx, idx, min(max_len, 50))
+                style_header_row(writer.sheets["Pathao"], result_df, header_format)
 
             st.download_button(
                 "Download repaired file",
@@ -357,23 +362,19 @@ def _render_processing_tab():
             vlink_df = st.session_state.get("pathao_vlink_df")
             if vlink_df is not None:
                 buf_vlink = BytesIO()
-                with pd.ExcelWriter(buf_vlink, engine="xlsxwriter") as writer:
-                    vlink_df.to_excel(writer, sheet_name="Verification", index=False)
-                    workbook = writer.book
-                    header_format = workbook.add_format(
-                        {
-                            "bold": True,
-                            "bg_color": "#4F81BD",
-                            "font_color": "white",
-                            "border": 1,
-                        }
+                with excel_writer(buf_vlink) as writer:
+                    vlink_df.assign(**{"Verification Link": None}).to_excel(
+                        writer, sheet_name="Verification", index=False
+                    )
+                    write_url_column(
+                        writer.sheets["Verification"], vlink_df, "Verification Link"
                     )
+                    workbook = writer.book
+                    header_format = workbook.add_format(EXCEL_HEADER_STYLE)
 
-                    ws = writer.sheets["Verification"]
-                    for idx, col in enumerate(vlink_df.columns):
-                        ws.write(0, idx, str(col), header_format)
-                        max_len = max(vlink_df[col].astype(str).map(len).max(), len(str(col))) + 2
-                        ws.set_column(idx, idx, min(max_len, 80))
+                    style_header_row(
+                        writer.sheets["Verification"], vlink_df, header_format, cap=80
+                    )
 
                 st.download_button(
                     "Download Verification Report",
@@ -671,17 +672,13 @@ def _render_status_tracking_tab():
                 st.dataframe(styled_df, use_container_width=True)
                 
                 buf_bulk = BytesIO()
-                with pd.ExcelWriter(buf_bulk, engine="xlsxwriter") as writer:
+                with excel_writer(buf_bulk) as writer:
                     updated_df.to_excel(writer, sheet_name="Live_Statuses", index=False)
                     workbook = writer.book
-                    header_format = workbook.add_format(
-                        {"bold": True, "bg_color": "#4F81BD", "font_color": "white", "border": 1}
+                    header_format = workbook.add_format(EXCEL_HEADER_STYLE)
+                    style_header_row(
+                        writer.sheets["Live_Statuses"], updated_df, header_format
                     )
-                    ws = writer.sheets["Live_Statuses"]
-                    for idx, col in enumerate(updated_df.columns):
-                        ws.write(0, idx, str(col), header_format)
-                        max_len = max(updated_df[col].astype(str).map(len).max(), len(str(col))) + 2
-                        ws.set_column(idx, idx, min(max_len, 50))
 
                 st.download_button(
                     "Download Updated Report",
@@ -1,15 +1,14 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from io import BytesIO
 
 from src.config.constants import SHIPPED_STATUSES
-from src.components.widgets import render_action_bar, render_reset_confirm, section_card
+from src.components.widgets import render_reset_confirm, section_card
 from src.processing.column_detection import find_columns
 from src.processing.data_processing import prepare_granular_data, aggregate_data
 from src.pages.dashboard_output import render_dashboard_output
 from src.services.woocommerce.client import load_from_woocommerce
-from src.utils.file_io import read_sales_file
+from src.utils.file_io import read_sales_file, to_excel_bytes
 from src.utils.logging import log_system_event
 from src.utils.snapshots import load_sales_snapshot, save_sales_snapshot
 
@@ -129,13 +128,10 @@ def render_manual_tab():
                     df = df[df[status_col].astype(str).str.lower().isin(SHIPPED_STATUSES)]
             st.info(f"Rows matching criteria: {len(df)}")
             
-            buf = BytesIO()
-            with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
-                df.to_excel(writer, index=False, sheet_name="Filtered Orders")
-            
             st.download_button(
                 label="💾 Export Filtered Orders (Excel)",
-                data=buf.getvalue(),
+                # Built on click rather than on every rerun of the filters.
+                data=lambda filtered=df: to_excel_bytes(filtered, sheet_name="Filtered Orders"),
                 file_name="Filtered_Orders.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
@@ -168,7 +164,10 @@ def render_manual_tab():
 
         st.caption(f"Active Data Source: {source_name}")
         auto_cols = find_columns(df)
+        # Column-derived option lists are built once and shared by every selectbox.
         all_cols = list(df.columns)
+        optional_cols = ["None", *all_cols]
+        col_positions = {col: i for i, col in reversed(list(enumerate(all_cols)))}
 
         section_card(
             "Column Mapping",
@@ -176,43 +175,47 @@ def render_manual_tab():
         )
 
         def get_col_idx(key):
-            if key in auto_cols and auto_cols[key] in all_cols:
-                return all_cols.index(auto_cols[key])
-            return 0
+            return col_positions.get(auto_cols.get(key), 0)
 
-        mapped_name = st.selectbox(
-            "Product Name", all_cols, index=get_col_idx("name"), key="manual_name"
-        )
-        mapped_cost = st.selectbox(
-            "Price/Cost", all_cols, index=get_col_idx("cost"), key="manual_cost"
-        )
-        mapped_qty = st.selectbox(
-            "Quantity", all_cols, index=get_col_idx("qty"), key="manual_qty"
-        )
-        mapped_date = st.selectbox(
-            "Date (Optional)",
-            ["None"] + all_cols,
-            index=get_col_idx("date") + 1 if "date" in auto_cols else 0,
-            key="manual_date",
-        )
-        mapped_order = st.selectbox(
-            "Order ID (Optional)",
-            ["None"] + all_cols,
-            index=get_col_idx("order_id") + 1 if "order_id" in auto_cols else 0,
-            key="manual_order",
-        )
-        mapped_phone = st.selectbox(
-            "Phone (Optional)",
-            ["None"] + all_cols,
-            index=get_col_idx("phone") + 1 if "phone" in auto_cols else 0,
-            key="manual_phone",
-        )
-        mapped_sku = st.selectbox(
-             "SKU (Optional)",
-             ["None"] + all_cols,
-             index=get_col_idx("sku") + 1 if "sku" in auto_cols else 0,
-             key="manual_sku"
-        )
+        # Mapping changes are batched by the form: one rerun on submit
+        # instead of one per selectbox change.
+        with st.form("manual_mapping_form"):
+            mapped_name = st.selectbox(
+                "Product Name", all_cols, index=get_col_idx("name"), key="manual_name"
+            )
+            mapped_cost = st.selectbox(
+                "Price/Cost", all_cols, index=get_col_idx("cost"), key="manual_cost"
+            )
+            mapped_qty = st.selectbox(
+                "Quantity", all_cols, index=get_col_idx("qty"), key="manual_qty"
+            )
+            mapped_date = st.selectbox(
+                "Date (Optional)",
+                optional_cols,
+                index=get_col_idx("date") + 1 if "date" in auto_cols else 0,
+                key="manual_date",
+            )
+            mapped_order = st.selectbox(
+                "Order ID (Optional)",
+                optional_cols,
+                index=get_col_idx("order_id") + 1 if "order_id" in auto_cols else 0,
+                key="manual_order",
+            )
+            mapped_phone = st.selectbox(
+                "Phone (Optional)",
+                optional_cols,
+                index=get_col_idx("phone") + 1 if "phone" in auto_cols else 0,
+                key="manual_phone",
+            )
+            mapped_sku = st.selectbox(
+                "SKU (Optional)",
+                optional_cols,
+                index=get_col_idx("sku") + 1 if "sku" in auto_cols else 0,
+                key="manual_sku",
+            )
+            generate_clicked = st.form_submit_button(
+                "Generate dashboard", type="primary", use_container_width=True
+            )
 
         final_mapping = {
             "name": mapped_name,
@@ -239,7 +242,6 @@ def render_manual_tab():
             else:
                 st.dataframe(df.head(10), use_container_width=True)
 
-        generate_clicked, _ = render_action_bar("Generate dashboard", "manual_generate")
         if generate_clicked:
             df_standard, timeframe = prepare_granular_data(df, final_mapping)
             if not df_standard.empty:
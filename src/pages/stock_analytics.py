@@ -11,6 +11,7 @@ from src.services.woocommerce.stock import fetch_woocommerce_stock
 from src.utils.product import get_base_product_name, get_size_from_name
 from src.utils.snapshots import load_stock_snapshot
 from src.utils.display import truncate_label
+from src.utils.file_io import EXCEL_HEADER_STYLE, excel_writer, style_header_row
 from src.utils.safe_ops import safe_filter, safe_render
 from src.config.constants import COMMON_CATS
 
@@ -136,9 +137,21 @@ def render_stock_analytics_tab():
         if "Product" not in df_raw.columns:
             st.error("Required 'Product' column not found in inventory data.")
             return
-        df_raw["Category"] = df_raw["Product"].apply(get_category_for_sales)
-        df_raw["Sub-Category"] = df_raw.apply(lambda r: get_sub_category_for_sales(r["Product"], r["Category"]), axis=1)
-        df_raw["Clean_Product"] = df_raw["Product"].apply(get_base_product_name)
+        # Products repeat across sizes/snapshots: derive each label once per distinct name.
+        products = pd.Series(df_raw["Product"].unique())
+        categories = products.map(get_category_for_sales)
+        by_product = pd.DataFrame(
+            {
+                "Category": categories.to_numpy(),
+                "Sub-Category": [
+                    get_sub_category_for_sales(name, cat) for name, cat in zip(products, categories)
+                ],
+                "Clean_Product": products.map(get_base_product_name).to_numpy(),
+            },
+            index=products,
+        )
+        for col in by_product.columns:
+            df_raw[col] = df_raw["Product"].map(by_product[col])
         df_raw["Filter_Identity"] = df_raw["Clean_Product"].astype(str) + " [" + df_raw["SKU"].astype(str) + "]"
 
     with st.expander("🛠️ Filter Intelligence", expanded=True):
@@ -169,7 +182,10 @@ def render_stock_analytics_tab():
 
         with f3:
             if "Size" not in df_base.columns:
-                 df_base["Size"] = df_base["Product"].astype(str).apply(get_size_from_name)
+                 product_names = df_base["Product"].astype(str)
+                 df_base["Size"] = product_names.map(
+                     {name: get_size_from_name(name) for name in product_names.unique()}
+                 )
             size_options = sorted([str(x) for x in df_base["Size"].unique().tolist() if x is not None])
             sel_sizes = st.multiselect("Select Size", size_options, placeholder="All Sizes")
             df = safe_filter(df_base, lambda d: d[d["Size"].isin(sel_sizes)], "Size") if sel_sizes else df_base
@@ -240,7 +256,7 @@ def render_stock_analytics_tab():
 
         st.divider()
         buf_stock = BytesIO()
-        with pd.ExcelWriter(buf_stock, engine="xlsxwriter") as wr:
+        with excel_writer(buf_stock) as wr:
             stock_metrics = pd.DataFrame([
                 {"Metric": "Total Warehouse Units", "Value": total_qty},
                 {"Metric": "Low Stock SKUs (<10)", "Value": low_stock},
@@ -251,7 +267,7 @@ def render_stock_analytics_tab():
             filtered_df.to_excel(wr, sheet_name="Granular Stock Details", index=False)
 
             workbook = wr.book
-            header_format = workbook.add_format({'bold': True, 'bg_color': '#4F81BD', 'font_color': 'white', 'border': 1})
+            header_format = workbook.add_format(EXCEL_HEADER_STYLE)
 
             # Auto-format column widths & apply header styles
             for sheet_name, df_ref in [
@@ -260,11 +276,7 @@ def render_stock_analytics_tab():
                 ("Granular Stock Details", filtered_df)
             ]:
                 if sheet_name in wr.sheets and not df_ref.empty:
-                    ws = wr.sheets[sheet_name]
-                    for idx, col in enumerate(df_ref.columns):
-                        ws.write(0, idx, str(col), header_format)
-                        max_len = max(df_ref[col].astype(str).map(len).max(), len(str(col))) + 2
-                        ws.set_column(idx, idx, min(max_len, 50))
+                    style_header_row(wr.sheets[sheet_name], df_ref, header_format)
 
         st.download_button(
             label="💾 Download Comprehensive Stock Report (Excel)",
@@ -9,37 +9,78 @@ from src.components.widgets import (
     render_reset_confirm,
     section_card,
 )
-from src.utils.file_io import to_excel_bytes, read_uploaded
-from src.processing.whatsapp_processor import WhatsAppOrderProcessor
+from src.utils.file_io import to_excel_bytes, read_uploaded, read_uploaded_async
+from src.processing.whatsapp_processor import WhatsAppOrderProcessor, find_best_column
 
 FUZZY_REQUIRED_FIELDS = {
     "phone": ["phone", "mobile", "contact", "billing phone"],
     "name": ["full name", "billing name", "name", "first name", "customer"],
     "product": ["product name", "item name", "product", "item"],
 }
+WP_HEADER_ROWS = 50
 
 
 def _reset_wp_state():
-    clear_state_keys(["wp_links_df", "wp_preview_df"])
+    clear_state_keys(["wp_links_df", "wp_preview_df", "wp_parse_job"])
+
+
+def _upload_parse_future(uploaded_file, header_columns):
+    """Returns the background parse for this upload, starting it on first sight.
+
+    Only the columns the processor maps are parsed, with phone/ID columns
+    read as text.
+    """
+    file_key = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+    job = st.session_state.get("wp_parse_job")
+    if job is None or job[0] != file_key:
+        read_kwargs = WhatsAppOrderProcessor().read_options(header_columns)
+        job = (file_key, read_uploaded_async(uploaded_file, **read_kwargs))
+        st.session_state.wp_parse_job = job
+    return job[1]
 
 
 def _has_fuzzy_column(columns: list[str], aliases: list[str]) -> bool:
-    cols_lower = [str(col).strip().lower() for col in columns]
-    for alias in aliases:
-        alias = alias.lower()
-        if alias in cols_lower:
-            return True
-    for alias in aliases:
-        alias = alias.lower()
-        if any(alias in col for col in cols_lower):
-            return True
-    return False
+    return find_best_column(columns, aliases) is not None
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _generate_links(source_df: pd.DataFrame, custom_template: str | None) -> pd.DataFrame:
+    """Runs the grouping + link pipeline, memoized on the data and template."""
+    processor = WhatsAppOrderProcessor()
+    processed = processor.process_orders(source_df.copy(), join_items=False)
+    return processor.create_whatsapp_links(processed, custom_template=custom_template)
+
+
+def _column_values(df: pd.DataFrame, col: str, default) -> list:
+    if col in df.columns:
+        return df[col].tolist()
+    return [default] * len(df)
+
+
+def _bulk_message_text(links_df: pd.DataFrame) -> str:
+    # Read whole columns once instead of materializing a Series per row.
+    names = _column_values(links_df, "Full Name (Billing)", "Unknown")
+    phones = _column_values(links_df, "Phone (Billing)", "")
+    links = _column_values(links_df, "whatsapp_link", "")
+    bulk_blocks = [
+        f"TO: {to_name} ({to_phone})\n{link}"
+        for to_name, to_phone, link in zip(names, phones, links)
+    ]
+    return "\n\n".join(bulk_blocks)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _links_excel_bytes(links_df: pd.DataFrame) -> bytes:
+    return to_excel_bytes(
+        links_df, sheet_name="WhatsAppLinks", url_columns=["whatsapp_link"]
+    )
 
 
 def _validate_wp_columns(df: pd.DataFrame):
+    columns = list(df.columns)
     missing = []
     for field, aliases in FUZZY_REQUIRED_FIELDS.items():
-        if not _has_fuzzy_column(list(df.columns), aliases):
+        if not _has_fuzzy_column(columns, aliases):
             missing.append(field)
     return len(missing) == 0, missing
 
@@ -81,6 +122,7 @@ def render_wp_tab():
                 st.error(f"URL fetch failed: {e}")
 
     preview_df = None
+    parse_future = None
     valid_file = False
 
     if fetch_live_clicked:
@@ -111,11 +153,15 @@ def render_wp_tab():
             st.error(f"Failed to fetch data: {exc}")
     elif wp_file:
         try:
-            preview_df = read_uploaded(wp_file)
-            st.session_state.wp_preview_df = preview_df
-            # Keep the summary card and use a fuzzy requirement check to avoid strict header dependence.
-            render_file_summary(wp_file, preview_df, [])
-            valid_file, missing_fields = _validate_wp_columns(preview_df)
+            # Column checks only need the first rows; the full sheet parses in the background.
+            header_df = read_uploaded(wp_file, nrows=WP_HEADER_ROWS)
+            parse_future = _upload_parse_future(wp_file, header_df.columns)
+            if parse_future.done():
+                # Keep the summary card and use a fuzzy requirement check to avoid strict header dependence.
+                render_file_summary(wp_file, parse_future.result(), [])
+            else:
+                st.caption(f"File: {wp_file.name} (parsing full sheet in the background...)")
+            valid_file, missing_fields = _validate_wp_columns(header_df)
             if valid_file:
                 st.success("Fuzzy required-column check passed.")
             else:
@@ -153,11 +199,11 @@ def render_wp_tab():
             )
         else:
             try:
-                processor = WhatsAppOrderProcessor()
-                processed = processor.process_orders(preview_df)
-                links_df = processor.create_whatsapp_links(
-                    processed,
-                    custom_template=custom_msg if custom_msg.strip() else None,
+                if wp_file and parse_future is not None:
+                    preview_df = parse_future.result()
+                    st.session_state.wp_preview_df = preview_df
+                links_df = _generate_links(
+                    preview_df, custom_msg if custom_msg.strip() else None
                 )
                 st.session_state.wp_links_df = links_df
                 st.success(f"Generated {len(links_df)} WhatsApp links.")
@@ -169,23 +215,16 @@ def render_wp_tab():
     if links_df is not None:
         st.dataframe(links_df.head(25), use_container_width=True)
 
-        bulk_blocks = []
-        for _, row in links_df.iterrows():
-            to_name = row.get("Full Name (Billing)", "Unknown")
-            to_phone = row.get("Phone (Billing)", "")
-            bulk_blocks.append(
-                f"TO: {to_name} ({to_phone})\n{row.get('whatsapp_link', '')}"
-            )
-
+        # Payloads are callables so they are only built when a download is clicked.
         st.download_button(
             "Export bulk message text",
-            "\n\n".join(bulk_blocks),
+            lambda: _bulk_message_text(links_df),
             "Bulk_WhatsApp_Messages.txt",
             use_container_width=True,
         )
         st.download_button(
             "Download WhatsApp links (Excel)",
-            to_excel_bytes(links_df, sheet_name="WhatsAppLinks"),
+            lambda: _links_excel_bytes(links_df),
             "WhatsApp_Verification_Links.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             type="primary",
@@ -31,14 +31,23 @@ def render_woocommerce_orders_tab():
             elif col != "Order ID":
                 agg_funcs[col] = "first"
                 
+        item_col = None
         if "Item Name" in df_copy.columns and "Quantity" in df_copy.columns:
-            df_copy["_Formatted_Item"] = df_copy.apply(lambda row: f"{row['Item Name']} (x{row['Quantity']})", axis=1)
-            agg_funcs["_Formatted_Item"] = lambda x: " | ".join(x.dropna().astype(str))
+            df_copy["_Formatted_Item"] = (
+                df_copy["Item Name"].map(str) + " (x" + df_copy["Quantity"].map(str) + ")"
+            )
+            item_col = "_Formatted_Item"
         elif "Item Name" in df_copy.columns:
-            agg_funcs["Item Name"] = lambda x: " | ".join(x.dropna().astype(str))
+            item_col = "Item Name"
 
         display_df = df_copy.groupby("Order ID", as_index=False).agg(agg_funcs)
-        
+
+        if item_col:
+            # Stringify once up front so each order is a plain str.join
+            items = df_copy[item_col].dropna().astype(str)
+            joined = items.groupby(df_copy.loc[items.index, "Order ID"]).agg(" | ".join)
+            display_df[item_col] = display_df["Order ID"].map(joined).fillna("")
+
         if "_Formatted_Item" in display_df.columns:
             display_df.rename(columns={"_Formatted_Item": "Items"}, inplace=True)
             if "Item Name" in display_df.columns:
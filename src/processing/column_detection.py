@@ -60,8 +60,9 @@ def find_columns(df: pd.DataFrame) -> dict[str, str]:
 
     found = {}
     try:
-        actual_cols = [str(c).strip() for c in df.columns]
-        lower_cols = [c.lower() for c in actual_cols]
+        stripped = df.columns.astype(str).str.strip()
+        actual_cols = stripped.tolist()
+        lower_cols = stripped.str.lower().tolist()
 
         for key, aliases in mapping.items():
             for alias in aliases:
@@ -1,6 +1,7 @@
 import re
 from io import BytesIO
 import pandas as pd
+from src.utils.file_io import excel_writer
 
 HEADER_TOKENS = {
     "Cons. ID",
@@ -13,6 +14,21 @@ HEADER_TOKENS = {
     "Action",
 }
 
+# Compiled once; the fuzzy parser runs all of these for every consignment block.
+_CONSIGNMENT_ID_RE = re.compile(r"^[A-Z]{2}\d{6}[A-Z0-9]+$")
+_AMOUNT_RE = re.compile(r"([\d,]+(?:\.\d+)?)")
+_RECORD_START_RE = re.compile(r"(DD\d{6}[A-Z0-9]+)")
+_ORDER_ID_RE = re.compile(r"\b(\d{6})\b")
+_STORE_RE = re.compile(r"(Deen Commerce|w DEEN WARI OUTLET|c DEEN CUMILLA OUTLET)")
+_PHONE_RE = re.compile(r"(01\d{9})")
+_COD_RE = re.compile(r"COD\s*\u09f3?\s*([\d,]+)")
+_CHARGE_RE = re.compile(r"Charge\s*\u09f3?\s*([\d,.]+)")
+_DISCOUNT_RE = re.compile(r"Discount\s*\u09f3?\s*([\d,]+)")
+_DELIVERY_STATUS_RE = re.compile(
+    r"(At Delivery Hub|Paid Return|Urgent Delivery Requested|Returned)"
+)
+_UPDATED_ON_RE = re.compile(r"Updated on\s*([\d/]+)")
+
 
 def clean_lines(raw: str):
     lines = []
@@ -27,11 +43,11 @@ def clean_lines(raw: str):
 
 
 def is_consignment_id(value: str) -> bool:
-    return bool(re.match(r"^[A-Z]{2}\d{6}[A-Z0-9]+$", value))
+    return bool(_CONSIGNMENT_ID_RE.match(value))
 
 
 def parse_amount(line: str):
-    m = re.search(r"([\d,]+(?:\.\d+)?)", line)
+    m = _AMOUNT_RE.search(line)
     if not m:
         return 0.0
     return float(m.group(1).replace(",", ""))
@@ -130,36 +146,32 @@ def parse_records(raw: str):
 
 
 def extract_fields_fuzzy(cons_id, text_block):
-    order_id_match = re.search(r"\b(\d{6})\b", text_block)
+    order_id_match = _ORDER_ID_RE.search(text_block)
     order_id = order_id_match.group(1) if order_id_match else ""
 
-    store_match = re.search(
-        r"(Deen Commerce|w DEEN WARI OUTLET|c DEEN CUMILLA OUTLET)", text_block
-    )
+    store_match = _STORE_RE.search(text_block)
     store = store_match.group(1) if store_match else ""
 
-    phone_match = re.search(r"(01\d{9})", text_block)
+    phone_match = _PHONE_RE.search(text_block)
     phone = phone_match.group(1) if phone_match else ""
 
-    cod_match = re.search(r"COD\s*\u09f3?\s*([\d,]+)", text_block)
+    cod_match = _COD_RE.search(text_block)
     cod = cod_match.group(1).replace(",", "") if cod_match else "0"
 
-    charge_match = re.search(r"Charge\s*\u09f3?\s*([\d,.]+)", text_block)
+    charge_match = _CHARGE_RE.search(text_block)
     charge = charge_match.group(1).replace(",", "") if charge_match else "0"
 
-    discount_match = re.search(r"Discount\s*\u09f3?\s*([\d,]+)", text_block)
+    discount_match = _DISCOUNT_RE.search(text_block)
     discount = discount_match.group(1).replace(",", "") if discount_match else "0"
 
     status = "Unpaid"
     if "Paid" in text_block and "Unpaid" not in text_block:
         status = "Paid"
 
-    delivery_match = re.search(
-        r"(At Delivery Hub|Paid Return|Urgent Delivery Requested|Returned)", text_block
-    )
+    delivery_match = _DELIVERY_STATUS_RE.search(text_block)
     delivery_status = delivery_match.group(1) if delivery_match else ""
 
-    updated_match = re.search(r"Updated on\s*([\d/]+)", text_block)
+    updated_match = _UPDATED_ON_RE.search(text_block)
     status_updated_on = updated_match.group(1) if updated_match else ""
 
     lines = text_block.split("\n")
@@ -180,21 +192,18 @@ def extract_fields_fuzzy(cons_id, text_block):
         order_id,
         cons_id,
     ]
+    # Lowercase the keywords once per block, not once per line
+    ignore_lower = [kw.lower() for kw in ignore_keywords if kw]
 
     for line in lines:
         clean_line = line.strip()
         if not clean_line:
             continue
-        if re.match(r"01\d{9}", clean_line):
+        if _PHONE_RE.match(clean_line):
             continue
 
-        should_ignore = False
-        for kw in ignore_keywords:
-            if kw and kw.lower() in clean_line.lower():
-                should_ignore = True
-                break
-
-        if not should_ignore:
+        line_lower = clean_line.lower()
+        if not any(kw in line_lower for kw in ignore_lower):
             info_lines.append(clean_line)
 
     filtered_info = []
@@ -230,8 +239,7 @@ def extract_fields_fuzzy(cons_id, text_block):
 
 
 def parse_data_fuzzy(raw_text):
-    record_start_pattern = re.compile(r"(DD\d{6}[A-Z0-9]+)")
-    parts = record_start_pattern.split(raw_text)
+    parts = _RECORD_START_RE.split(raw_text)
     records = []
     for i in range(1, len(parts), 2):
         if i + 1 < len(parts):
@@ -244,10 +252,10 @@ def parse_data_fuzzy(raw_text):
 
 def df_to_excel_bytes(df: pd.DataFrame) -> bytes:
     output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+    with excel_writer(output) as writer:
         df.to_excel(writer, index=False, sheet_name="Deliveries")
-        ws = writer.book["Deliveries"]
-        ws.freeze_panes = "A2"
+        ws = writer.sheets["Deliveries"]
+        ws.freeze_panes(1, 0)
 
         widths = {
             "A": 18,
@@ -265,13 +273,10 @@ def df_to_excel_bytes(df: pd.DataFrame) -> bytes:
             "M": 14,
             "N": 14,
         }
+        # Column-level formats replace the per-cell number_format walk.
+        money_format = writer.book.add_format({"num_format": "#,##0.00"})
         for col, width in widths.items():
-            ws.column_dimensions[col].width = width
-
-        for row in range(2, ws.max_row + 1):
-            ws[f"J{row}"].number_format = "#,##0.00"
-            ws[f"K{row}"].number_format = "#,##0.00"
-            ws[f"L{row}"].number_format = "#,##0.00"
+            cell_format = money_format if col in ("J", "K", "L") else None
+            ws.set_column(f"{col}:{col}", width, cell_format)
 
-    output.seek(0)
-    return output.read()
+    return output.getvalue()
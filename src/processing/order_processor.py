@@ -1,9 +1,11 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 import os
 import json
 import re
 from functools import lru_cache
+from itertools import compress
 from src.utils.product import get_category_from_name
 from src.utils.text import normalize_city_name, peek_zone_from_address
 from fuzzywuzzy import process
@@ -22,18 +24,13 @@ def _title_text_part(value):
 
 
 def _dedupe_address_parts(parts):
-    deduped = []
-    seen = set()
+    # Insertion-ordered dict keyed case-insensitively; first spelling wins
+    deduped = {}
     for part in parts:
         cleaned = _clean_text_part(part)
-        if not cleaned:
-            continue
-        key = cleaned.casefold()
-        if key in seen:
-            continue
-        deduped.append(cleaned)
-        seen.add(key)
-    return deduped
+        if cleaned:
+            deduped.setdefault(cleaned.casefold(), cleaned)
+    return list(deduped.values())
 
 
 @lru_cache(maxsize=1)
@@ -78,6 +75,52 @@ def _find_city_for_zone(zone_text, pathao_map):
     return "", ""
 
 
+@lru_cache(maxsize=4096)
+def _match_pathao_city_zone(recipient_city, extracted_zone, inferred_zone):
+    """
+    Corrects city and zone against the Pathao map, memoized per text combo.
+    Orders from the same district/thana repeat these values, so each
+    combination is fuzzy-matched once per loaded map. Returns the city,
+    the zone and the matched zone's areas (empty if the zone did not match).
+    """
+    pathao_map = _load_pathao_map()
+    if not recipient_city:
+        inferred_city, official_zone = _find_city_for_zone(extracted_zone or inferred_zone, pathao_map)
+        if inferred_city:
+            recipient_city = inferred_city
+            if official_zone:
+                extracted_zone = official_zone
+
+    # 1. Match City
+    city_data = pathao_map.get(recipient_city)
+    if not city_data and recipient_city:
+        # Try fuzzy matching city name if direct lookup fails
+        match = process.extractOne(recipient_city, pathao_map.keys())
+        if match and match[1] > 85:
+            recipient_city = match[0]
+            city_data = pathao_map[match[0]]
+
+    areas_list = []
+    if city_data:
+        zones_dict = city_data.get("zones", {})
+        if extracted_zone and zones_dict:
+            # 2. Match Zone
+            zone_match = process.extractOne(extracted_zone, zones_dict.keys())
+            if zone_match and zone_match[1] > 75:
+                extracted_zone = zone_match[0]
+                areas_list = zones_dict[extracted_zone].get("areas", [])
+    return recipient_city, extracted_zone, areas_list
+
+
+def reload_pathao_map():
+    """
+    Drops the cached Pathao map and its memoized matches, e.g. after the
+    map file has been re-synced.
+    """
+    _load_pathao_map.cache_clear()
+    _match_pathao_city_zone.cache_clear()
+
+
 def _coerce_item_qty(value, default=1):
     try:
         qty = int(float(value))
@@ -154,6 +197,11 @@ def build_item_description(items, suffix_info=""):
     return full_desc + f"; ({' - '.join(suffix_parts)})"
 
 
+_QTY_PREFIX_RE = re.compile(r"^(\d+)\s*[xX]\s+(.+)$")
+_QTY_SUFFIX_RE = re.compile(r"^(.+?)\s*[xX]\s*(\d+)$")
+_QTY_PAREN_RE = re.compile(r"^(.+?)\s*\((\d+)\s*(?:pcs?|pieces?)\)$", re.IGNORECASE)
+
+
 def parse_manual_item_lines(raw_text):
     parsed_items = []
     for raw_line in str(raw_text or "").splitlines():
@@ -164,9 +212,9 @@ def parse_manual_item_lines(raw_text):
         qty = 1
         payload = line
 
-        prefix_match = re.match(r"^(\d+)\s*[xX]\s+(.+)$", payload)
-        suffix_match = re.match(r"^(.+?)\s*[xX]\s*(\d+)$", payload)
-        paren_match = re.match(r"^(.+?)\s*\((\d+)\s*(?:pcs?|pieces?)\)$", payload, re.IGNORECASE)
+        prefix_match = _QTY_PREFIX_RE.match(payload)
+        suffix_match = _QTY_SUFFIX_RE.match(payload)
+        paren_match = _QTY_PAREN_RE.match(payload)
 
         if prefix_match:
             qty = _coerce_item_qty(prefix_match.group(1), default=1)
@@ -315,46 +363,96 @@ def identify_columns(df):
     return cols
 
 
-def process_single_order_group(phone, group, data_cols):
+# Major cities searched for in the raw address when no district resolved.
+_FALLBACK_CITIES = tuple(
+    (city, city.lower())
+    for city in ("Dhaka", "Chittagong", "Chattogram", "Sylhet", "Khulna", "Rajshahi", "Barisal", "Rangpur")
+)
+
+
+# Helper column holding each row's payment label, filled once per upload
+PAYMENT_LABEL_COL = "_payment_label"
+# Helper column flagging the first row of each (phone, order) pair
+FIRST_OF_ORDER_COL = "_first_of_order"
+
+
+def payment_labels_for(df):
+    """
+    "Paid by Bkash" / "Paid by SSL" per row, or "" when the amount is still
+    to be collected, from the lowercased Payment Method Title.
+    """
+    if "Payment Method Title" not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    methods = df["Payment Method Title"].astype(str).str.lower()
+    is_paid = methods.str.contains("pay online|ssl|bkash", regex=True, na=False)
+    is_bkash = methods.str.contains("bkash", regex=False, na=False)
+    labels = np.where(is_paid, np.where(is_bkash, "Paid by Bkash", "Paid by SSL"), "")
+    return pd.Series(labels, index=df.index, dtype=object)
+
+
+def _group_column(group, col, default):
+    """A group's column as a list, or ``default`` per row when it is absent."""
+    if col in group.columns:
+        return group[col].tolist()
+    return [default] * len(group)
+
+
+def _order_level_column(orders, col, default, first_of_order=None):
+    """Like ``_group_column``, keeping only the rows flagged in ``first_of_order``."""
+    values = _group_column(orders, col, default)
+    if first_of_order is None:
+        return values
+    return list(compress(values, first_of_order))
+
+
+def process_single_order_group(phone, group, data_cols, total_qty=None):
     """
     Processes a group of rows belonging to a single order (phone number).
+    ``total_qty`` may be passed in when it was summed for all groups at once.
     """
     order_col = data_cols.get("order_col", "Order Number")
 
-    if order_col in group.columns:
+    first_of_order = None
+    if FIRST_OF_ORDER_COL in group.columns:
+        # Flags were set for the whole upload; filter the few per-order
+        # columns as lists rather than copying every column of the group
+        unique_orders = group
+        first_of_order = group[FIRST_OF_ORDER_COL].tolist()
+    elif order_col in group.columns:
         unique_orders = group.drop_duplicates(subset=[order_col])
     else:
         # Fallback if no order identification column is found
         unique_orders = group.head(1)
 
     first_row = group.iloc[0]
-    total_qty = group["Quantity"].sum()
-    order_items = []
-    for _, row in group.iterrows():
-        order_items.append(
-            {
-                "item_name": row.get("Item Name", ""),
-                "sku": row.get("SKU", ""),
-                "qty": row.get("Quantity", 0),
-            }
+    if total_qty is None:
+        total_qty = group["Quantity"].sum()
+    # Zip the three item columns; iterrows would box every row of the group
+    order_items = [
+        {"item_name": item_name, "sku": sku, "qty": qty}
+        for item_name, sku, qty in zip(
+            _group_column(group, "Item Name", ""),
+            _group_column(group, "SKU", ""),
+            _group_column(group, "Quantity", 0),
         )
+    ]
 
     # --- Amount to Collect & Payment Info (across unique orders) ---
     total_to_collect = 0
     trx_types = set()
 
-    for _, order_row in unique_orders.iterrows():
-        order_total = order_row.get("Order Total Amount", 0)
-        pay_method = str(order_row.get("Payment Method Title", "")).lower()
-
-        # Determine if this specific order is already paid
-        is_paid = any(kw in pay_method for kw in ["pay online", "ssl", "bkash"])
-
-        if is_paid:
-            if "bkash" in pay_method:
-                trx_types.add("Paid by Bkash")
-            else:
-                trx_types.add("Paid by SSL")
+    if PAYMENT_LABEL_COL in unique_orders.columns:
+        payment_labels = unique_orders[PAYMENT_LABEL_COL].tolist()
+    else:
+        payment_labels = payment_labels_for(unique_orders).tolist()
+    if first_of_order is not None:
+        payment_labels = list(compress(payment_labels, first_of_order))
+    for order_total, payment_label in zip(
+        _order_level_column(unique_orders, "Order Total Amount", 0, first_of_order),
+        payment_labels,
+    ):
+        if payment_label:
+            trx_types.add(payment_label)
         else:
             total_to_collect += order_total
 
@@ -395,42 +493,18 @@ def process_single_order_group(phone, group, data_cols):
         extracted_zone = inferred_zone
 
     # Load Pathao Map for intelligent correction
-    pathao_map = _load_pathao_map()
-    if pathao_map:
+    if _load_pathao_map():
         try:
-            if not recipient_city:
-                inferred_city, official_zone = _find_city_for_zone(extracted_zone or inferred_zone, pathao_map)
-                if inferred_city:
-                    recipient_city = inferred_city
-                    if official_zone:
-                        extracted_zone = official_zone
-
-            # 1. Match City
-            city_data = pathao_map.get(recipient_city)
-            if not city_data and recipient_city:
-                # Try fuzzy matching city name if direct lookup fails
-                match = process.extractOne(recipient_city, pathao_map.keys())
-                if match and match[1] > 85:
-                    recipient_city = match[0]
-                    city_data = pathao_map[match[0]]
-
-            if city_data:
-                zones_dict = city_data.get("zones", {})
-                if extracted_zone and zones_dict:
-                    # 2. Match Zone
-                    zone_match = process.extractOne(extracted_zone, zones_dict.keys())
-                    if zone_match and zone_match[1] > 75:
-                        official_zone_name = zone_match[0]
-                        extracted_zone = official_zone_name
-
-                        # 3. Match Area (Optional)
-                        areas_list = zones_dict[official_zone_name].get("areas", [])
-                        if areas_list:
-                            # Try to find area name in the Address since it's rarely a separate column in WooCommerce
-                            area_names = [a["area_name"] for a in areas_list]
-                            area_match = process.extractOne(raw_address or extracted_zone, area_names)
-                            if area_match and area_match[1] > 90:
-                                recipient_area = area_match[0]
+            recipient_city, extracted_zone, areas_list = _match_pathao_city_zone(
+                recipient_city, extracted_zone, inferred_zone
+            )
+            # 3. Match Area (Optional)
+            if areas_list:
+                # Try to find area name in the Address since it's rarely a separate column in WooCommerce
+                area_names = [a["area_name"] for a in areas_list]
+                area_match = process.extractOne(raw_address or extracted_zone, area_names)
+                if area_match and area_match[1] > 90:
+                    recipient_area = area_match[0]
         except:
             pass # Fallback to raw data if map fails to load
 
@@ -438,7 +512,9 @@ def process_single_order_group(phone, group, data_cols):
     if order_col in unique_orders.columns:
         order_ids = [
             str(x)
-            for x in unique_orders[order_col].unique()
+            for x in dict.fromkeys(
+                _order_level_column(unique_orders, order_col, "", first_of_order)
+            )
             if str(x).lower() != "nan"
         ]
         combined_merchant_id = ", ".join(order_ids)
@@ -452,8 +528,9 @@ def process_single_order_group(phone, group, data_cols):
 
     if not recipient_city or recipient_city.lower() in ["unknown", "nan", ""]:
         # Try to find city in address as last resort
-        for city_name in ["Dhaka", "Chittagong", "Chattogram", "Sylhet", "Khulna", "Rajshahi", "Barisal", "Rangpur"]:
-            if city_name.lower() in raw_address.lower():
+        address_lower = raw_address.lower()
+        for city_name, city_lower in _FALLBACK_CITIES:
+            if city_lower in address_lower:
                 recipient_city = city_name
                 break
         if not recipient_city: recipient_city = "Dhaka" # Default to capital
@@ -510,13 +587,23 @@ def process_orders_dataframe(df):
     if "Phone (Billing)" not in df.columns:
         raise ValueError("Column 'Phone (Billing)' not found in uploaded file.")
 
-    # 2. Group
+    # 2. Group (payment labels, first-of-order flags and quantity totals are
+    # resolved column-wise up front instead of once per group)
+    helper_cols = {PAYMENT_LABEL_COL: payment_labels_for(df)}
+    order_col = data_cols.get("order_col", "Order Number")
+    if order_col in df.columns:
+        helper_cols[FIRST_OF_ORDER_COL] = ~df.duplicated(subset=["Phone (Billing)", order_col])
+    df = df.assign(**helper_cols)
     grouped = df.groupby("Phone (Billing)")
+    if "Quantity" in df.columns:
+        qty_totals = grouped["Quantity"].sum().tolist()
+    else:
+        qty_totals = [None] * grouped.ngroups
     processed_data = []
 
     # 3. Process Groups
-    for phone, group in grouped:
-        record = process_single_order_group(phone, group, data_cols)
+    for (phone, group), total_qty in zip(grouped, qty_totals):
+        record = process_single_order_group(phone, group, data_cols, total_qty)
         processed_data.append(record)
 
     # 4. Result DF
@@ -1,8 +1,363 @@
+import numpy as np
 import pandas as pd
 import polars as pl
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import urllib.parse
 import re
+from functools import lru_cache
+from itertools import chain, repeat
+
+
+@lru_cache(maxsize=32)
+def _column_lookup(columns: tuple):
+    """Lowercased column names plus an exact-name -> first-index map."""
+    cols_lower = tuple(str(c).lower().strip() for c in columns)
+    exact = {}
+    for i, c_l in enumerate(cols_lower):
+        exact.setdefault(c_l, i)
+    return cols_lower, exact
+
+
+@lru_cache(maxsize=64)
+def _keyword_pattern(target_keys: tuple):
+    """Lowercased keys plus one compiled alternation matching any of them."""
+    keys_lower = tuple(key.lower() for key in target_keys)
+    return keys_lower, re.compile("|".join(map(re.escape, keys_lower)))
+
+
+def find_best_column(df_cols, target_keys, default=None):
+    """Find the best matching column: exact name first, then substring match.
+
+    The lowercased header index is cached per column tuple, so resolving
+    several fields against the same frame normalizes the headers once.
+    """
+    columns = tuple(df_cols)
+    cols_lower, exact = _column_lookup(columns)
+    keys_lower, pattern = _keyword_pattern(tuple(target_keys))
+    for key_l in keys_lower:
+        if key_l in exact:
+            return columns[exact[key_l]]
+    # Try partial match fallback: one regex pass narrows the columns, then
+    # key priority picks among the (usually few) candidates.
+    candidates = [i for i, c_l in enumerate(cols_lower) if pattern.search(c_l)]
+    for key_l in keys_lower:
+        for i in candidates:
+            if key_l in cols_lower[i]:
+                return columns[i]
+    return default
+
+
+# Fuzzy aliases and fallback header for every config column.
+COLUMN_ALIASES = {
+    "phone_col": (
+        ["phone", "mobile", "contact", "billing phone"],
+        "Phone (Billing)",
+    ),
+    "name_col": (
+        ["full name", "billing name", "name", "first name", "customer"],
+        "Full Name (Billing)",
+    ),
+    "order_id_col": (["order id", "order #", "id", "order number"], "Order ID"),
+    "product_col": (
+        ["product name", "item name", "product", "item"],
+        "Product Name (main)",
+    ),
+    "sku_col": (["sku", "item sku", "code"], "SKU"),
+    "quantity_col": (["quantity", "qty", "item qty"], "Quantity"),
+    "price_col": (["item cost", "price", "cost"], "Item cost"),
+    "payment_method_col": (
+        ["payment method", "gateway"],
+        "Payment Method Title",
+    ),
+    "address_col": (
+        ["address", "shipping address", "billing address"],
+        "Address 1&2 (Billing)",
+    ),
+    "order_total_col": (
+        ["order total", "total amount", "total"],
+        "Order Total Amount",
+    ),
+    "city_col": (
+        ["city", "state", "zip", "location"],
+        "City, State, Zip (Billing)",
+    ),
+}
+
+# Identifier columns that must be read as text so IDs and phones keep their digits.
+TEXT_ID_COLUMNS = ("phone_col", "order_id_col", "sku_col")
+
+# Every column the pipeline treats as text; read as the "string" dtype so the
+# .str work in process_orders runs on Arrow-backed arrays (with pyarrow).
+TEXT_COLUMNS = TEXT_ID_COLUMNS + (
+    "name_col",
+    "product_col",
+    "payment_method_col",
+    "address_col",
+    "city_col",
+)
+
+DEFAULT_MESSAGE_TEMPLATE = "\n".join(
+    [
+        "*Order Verification From DEEN Commerce*",
+        "",
+        "Assalamu Alaikum, {salutation}!",
+        "",
+        "Dear {name},",
+        "",
+        "Please verify your order details:",
+        "",
+        "*Order ID:* {order_id}",
+        "",
+        "*Your Order:*",
+        "{products_list}",
+        "",
+        "*Total Amount:* {total}",
+        "",
+        "*Shipping Address:*",
+        "{address}",
+        "",
+        "Please confirm the order and address.",
+        "If any correction is needed, please let us know the possible adjustment.",
+        "",
+        "*Delivery fees apply for returns.*",
+        "",
+        "Thank you for shopping with DEEN Commerce! Grab our latest collection on: https://deencommerce.com/",
+    ]
+)
+
+_PLACEHOLDER_RE = re.compile(r"\{(name|salutation|order_id|products_list|total|address)\}")
+
+
+# quote()'s default safe set. Keeping "/" unescaped keeps links byte-identical
+# to quote(message) (e.g. "https://deencommerce.com/" in the footer).
+_QUOTE_SAFE = "/"
+
+
+def _quote(text: str) -> str:
+    """``urllib.parse.quote(text)`` without its per-call str/encoding dispatch.
+
+    Encoding to UTF-8 here and quoting the bytes skips quote()'s type and
+    encoding checks. Per-character alternatives (``str.translate`` tables,
+    ``re.sub`` callbacks) measured slower than one ``quote_from_bytes`` over
+    a batched string, which is how ``encode_messages`` calls it.
+    """
+    return urllib.parse.quote_from_bytes(text.encode("utf-8"), safe=_QUOTE_SAFE)
+
+
+@lru_cache(maxsize=16)
+def _encoded_template(template: str) -> tuple:
+    """Splits a template into pre-encoded static text and placeholder names.
+
+    ``quote`` works character by character, so encoded fragments can be
+    concatenated; the boilerplate is encoded once per template instead of
+    once per order. Returns the encoded head plus ``(placeholder,
+    encoded text that follows it)`` pairs.
+    """
+    parts = _PLACEHOLDER_RE.split(template)
+    encoded = [_quote(part) for part in parts[::2]]
+    return encoded[0], tuple(zip(parts[1::2], encoded[1:]))
+
+
+def encode_message(template: str, values: Dict[str, str]) -> str:
+    """URL-encoded message: cached static parts plus quoted substitutions."""
+    head, pairs = _encoded_template(template)
+    pieces = [head]
+    for placeholder, tail in pairs:
+        pieces.append(_quote(values[placeholder]))
+        pieces.append(tail)
+    return "".join(pieces)
+
+
+def _quote_all(texts: List[str]) -> List[str]:
+    """``_quote`` over many strings with a single encode/quote call.
+
+    NUL never occurs in spreadsheet text, so the batch is NUL-joined and
+    split on its escape; texts that do contain NUL are quoted one by one.
+    Repeated texts (salutations, totals, same-item orders) are quoted once.
+    """
+    distinct = list(dict.fromkeys(texts))
+    joined = "\x00".join(distinct)
+    if joined.count("\x00") != len(distinct) - 1:
+        quoted = [_quote(text) for text in distinct]
+    else:
+        quoted = _quote(joined).split("%00")
+    if len(distinct) == len(texts):
+        return quoted
+    by_text = dict(zip(distinct, quoted))
+    return [by_text[text] for text in texts]
+
+
+def encode_messages(template: str, values: Dict[str, List[str]]) -> List[str]:
+    """``encode_message`` for many orders; ``values`` maps placeholder -> column.
+
+    Each placeholder column is quoted in one batch instead of once per order.
+    """
+    head, pairs = _encoded_template(template)
+    if not pairs:
+        return [head] * len(next(iter(values.values()), []))
+    quoted = {placeholder: _quote_all(values[placeholder]) for placeholder, _ in pairs}
+    columns = [quoted[placeholder] for placeholder, _ in pairs]
+    tails = [tail for _, tail in pairs]
+    return [
+        head + "".join([text + tail for text, tail in zip(texts, tails)])
+        for texts in zip(*columns)
+    ]
+
+
+# Name tokens that switch the greeting to "Madam".
+FEMALE_INDICATORS = frozenset(
+    {
+        "ms",
+        "miss",
+        "mrs",
+        "mst",
+        "begum",
+        "khatun",
+        "akter",
+        "parvin",
+        "sultana",
+        "jahan",
+        "bibi",
+        "rani",
+        "devi",
+        "nahar",
+        "ferdous",
+        "ara",
+        "banu",
+        "fatema",
+        "aisha",
+        "khadija",
+        "nusrat",
+        "farhana",
+        "sadia",
+        "jannatul",
+        "sumaiya",
+        "tanjina",
+        "fariha",
+        "sharmin",
+        "nasrin",
+        "salma",
+        "shirin",
+        "rumana",
+        "sabina",
+        "moumita",
+    }
+)
+
+
+# Payment methods (lowercased substrings) that mean nothing is left to collect.
+PAID_METHOD_PATTERN = "|".join(("bkash", "online", "ssl", "paid"))
+
+# Separator between the items of one grouped order.
+ITEM_SEP = "\n- "
+
+
+def _is_item_list(value) -> bool:
+    return isinstance(value, (list, tuple, np.ndarray))
+
+
+def _item_list(value) -> list:
+    """Items of a grouped order, whether kept as a list or joined with ITEM_SEP."""
+    if _is_item_list(value):
+        # Grouped columns arrive as object ndarrays; tolist() unboxes in C
+        items = value.tolist() if isinstance(value, np.ndarray) else value
+        return list(map(str, items)) or [""]
+    return str(value).split(ITEM_SEP)
+
+
+_DOT_WORD_RE = re.compile(r"\.(\w)")
+_NON_DIGIT_RE = re.compile(r"\D+")
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+
+
+class _NonDigitTable(dict):
+    """``str.translate`` table that keeps only digits, folded to ASCII.
+
+    Phones typed with Bangla (or other Unicode) digits, e.g. "০১৭...", come
+    out as "017..."; everything else is deleted. Entries are filled on first
+    sight of each code point, so the table stays as small as the character
+    set actually seen in phone columns.
+    """
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        value = ord("0") + int(char) if char.isdecimal() else None
+        self[codepoint] = value
+        return value
+
+
+_NON_DIGIT_TABLE = _NonDigitTable()
+
+
+def _capitalize_word(w: str) -> str:
+    """Capitalize a word, treating hyphen/apostrophe/dot pieces separately."""
+    if "-" in w:
+        return "-".join(map(str.capitalize, w.split("-")))
+    if "'" in w:
+        return "'".join(map(str.capitalize, w.split("'")))
+    if "." in w and not w.endswith("."):
+        return ". ".join(map(str.capitalize, w.split(".")))
+    return w.capitalize()
+
+
+def _capitalize_words(text: str) -> str:
+    """Capitalize each word; plain words skip the per-word separator checks."""
+    words = text.split()
+    if "-" in text or "'" in text or "." in text:
+        return " ".join(map(_capitalize_word, words))
+    return " ".join(map(str.capitalize, words))
+
+
+@lru_cache(maxsize=1 << 16)
+def _format_text(text: str) -> str:
+    """Cached body of ``format_text``; names and addresses repeat across orders."""
+    if not text.strip():
+        return ""
+
+    # Handle comma-separated parts (addresses); _capitalize_words re-splits
+    # on whitespace, so parts need no strip, only a blank check
+    if "," in text:
+        return ", ".join(
+            [_capitalize_words(part) for part in text.split(",") if part and not part.isspace()]
+        )
+
+    # Handle regular text
+    text = _DOT_WORD_RE.sub(r". \1", text.strip())
+    return _capitalize_words(text)
+
+
+def _item_lines(products: list, quantities: list, prices: list) -> str:
+    """One "- product - Qty: q - Price: p BDT" line per product.
+
+    Items are zipped positionally; a product past the end of the quantity
+    or price list just leaves that part out.
+    """
+    if len(quantities) >= len(products) and len(prices) >= len(products):
+        # Usual case (every item has a qty and price): one f-string per line
+        return "\n".join(
+            [
+                f"- {product.strip()} - Qty: {qty.strip()} - Price: {price.strip()} BDT"
+                for product, qty, price in zip(products, quantities, prices)
+            ]
+        )
+    lines = []
+    for product, qty, price in zip(
+        products, chain(quantities, repeat(None)), chain(prices, repeat(None))
+    ):
+        line = f"- {product.strip()}"
+        if qty is not None:
+            line += f" - Qty: {qty.strip()}"
+        if price is not None:
+            line += f" - Price: {price.strip()} BDT"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _column_list(df: pd.DataFrame, col, default) -> list:
+    """A column as a plain list, or ``default`` per row when it is absent."""
+    if col is not None and col in df.columns:
+        return df[col].tolist()
+    return [default] * len(df)
 
 
 class WhatsAppOrderProcessor:
@@ -26,43 +381,71 @@ class WhatsAppOrderProcessor:
         """Clean and format phone number for WhatsApp."""
         if pd.isna(phone):
             return ""
-        phone = "".join(filter(str.isdigit, str(phone)))
+        phone = str(phone).translate(_NON_DIGIT_TABLE)
         if phone.startswith("0"):
             return "0" + phone[1:]
         elif not phone.startswith(("88", "+88")):
             return "0" + phone
         return phone
 
+    def clean_phone_numbers(self, phones: pd.Series) -> pd.Series:
+        """Vectorized ``clean_phone_number`` for a whole column.
+
+        Only the (rare) non-ASCII values go through ``str.translate`` to fold
+        Unicode digits; the rest is stripped by one regex pass.
+        """
+        text = phones.astype(str)
+        # str.isascii() is pandas >= 3 only; the regex works on 2.x too
+        non_ascii = text.str.contains(_NON_ASCII_RE.pattern, regex=True, na=False).astype(bool)
+        if non_ascii.any():
+            text = text.where(~non_ascii, text[non_ascii].str.translate(_NON_DIGIT_TABLE))
+        digits = (
+            text.str.replace(_NON_DIGIT_RE.pattern, "", regex=True)
+            .fillna("")
+        )
+        keep = digits.str.startswith(("0", "88"))
+        cleaned = digits.where(keep, "0" + digits)
+        return cleaned.where(phones.notna(), "")
+
+    def whatsapp_numbers(self, phones: pd.Series) -> pd.Series:
+        """International numbers (no "+") for cleaned phones, column-wise.
+
+        Ten or more digits are read as a local number and keep their last
+        ten digits behind "880", so "017..." and "88017..." both become
+        "88017..."; shorter values just get the "88" prefix.
+        """
+        phones = phones.fillna("").astype(str)
+        return pd.Series(
+            np.where(phones.str.len() >= 10, "880" + phones.str[-10:], "88" + phones),
+            index=phones.index,
+            dtype=object,
+        )
+
     def format_text(self, text: str) -> str:
         """Standardize text formatting (capitalization, spacing)."""
-        if not isinstance(text, str) or not text.strip():
+        if not isinstance(text, str):
             return ""
-
-        # Helper to capitalize words properly
-        def capitalize_word(w):
-            if "-" in w:
-                return "-".join(p.capitalize() for p in w.split("-"))
-            if "'" in w:
-                return "'".join(p.capitalize() for p in w.split("'"))
-            if "." in w and not w.endswith("."):
-                return ". ".join(p.capitalize() for p in w.split("."))
-            return w.capitalize()
-
-        # Handle comma-separated parts (addresses)
-        if "," in text:
-            parts = [p.strip() for p in text.split(",")]
-            formatted_parts = []
-            for part in parts:
-                if not part:
-                    continue
-                formatted_parts.append(
-                    " ".join(capitalize_word(w) for w in part.split())
-                )
-            return ", ".join(formatted_parts)
-
-        # Handle regular text
-        text = re.sub(r"\.(\w)", r". \1", text.strip())
-        return " ".join(capitalize_word(w) for w in text.split())
+        return _format_text(text)
+
+    def format_text_series(self, values: pd.Series) -> pd.Series:
+        """``format_text`` over a column, NaN -> "".
+
+        Names and addresses repeat heavily across order lines, so each
+        distinct value is formatted once and mapped back onto the column.
+        When every value is already distinct (one row per customer after
+        grouping), ``unique()`` keeps row order, so the remap is skipped.
+        The uniques are pulled out as one Python list (iterating an Arrow
+        array boxes each value) and, all being str, go straight to the
+        cached formatter.
+        """
+        text = values.astype(str).where(values.notna(), "")
+        uniques = text.unique().tolist()
+        if len(uniques) == len(text):
+            return pd.Series(
+                list(map(_format_text, uniques)), index=values.index, dtype=str
+            )
+        formatted = dict(zip(uniques, map(_format_text, uniques)))
+        return text.map(formatted).astype(str)
 
     def format_name(self, name):
         return self.format_text(str(name)) if pd.notna(name) else ""
@@ -75,114 +458,115 @@ class WhatsAppOrderProcessor:
         ]
         return "\n".join(parts)
 
+    def format_address_series(
+        self, *address_columns: pd.Series, preformatted: bool = False
+    ) -> pd.Series:
+        """Vectorized ``format_address`` over aligned columns.
+
+        Blank cells are masked out before formatting, so only real address
+        parts reach the formatter (and a column of distinct addresses with
+        a few blanks still takes the no-remap path). With
+        ``preformatted=True`` the columns already went through
+        ``format_text_series`` and are only joined.
+        """
+        joined = None
+        for column in address_columns:
+            present = column.notna() & column.astype(str).str.strip().ne("")
+            if preformatted:
+                formatted = column.astype(str).where(present, "")
+            else:
+                formatted = self.format_text_series(column[present]).reindex(
+                    column.index, fill_value=""
+                )
+            if joined is None:
+                joined, any_present = formatted, present
+                continue
+            joined = (joined + "\n" + formatted).where(
+                any_present & present, joined.where(any_present, formatted)
+            )
+            any_present = any_present | present
+        return joined.astype(object)
+
     def detect_gender_salutation(self, name: str) -> str:
         """Detect gender from name for appropriate salutation."""
         if not isinstance(name, str):
             return "Sir"
 
-        name_lower = name.lower()
-        female_indicators = {
-            "ms",
-            "miss",
-            "mrs",
-            "mst",
-            "begum",
-            "khatun",
-            "akter",
-            "parvin",
-            "sultana",
-            "jahan",
-            "bibi",
-            "rani",
-            "devi",
-            "nahar",
-            "ferdous",
-            "ara",
-            "banu",
-            "fatema",
-            "aisha",
-            "khadija",
-            "nusrat",
-            "farhana",
-            "sadia",
-            "jannatul",
-            "sumaiya",
-            "tanjina",
-            "fariha",
-            "sharmin",
-            "nasrin",
-            "salma",
-            "shirin",
-            "rumana",
-            "sabina",
-            "moumita",
-        }
+        # isdisjoint stops at the first female token
+        if FEMALE_INDICATORS.isdisjoint(name.lower().replace(".", " ").split()):
+            return "Sir"
+        return "Madam"
+
+    def detect_gender_salutations(self, names: pd.Series) -> pd.Series:
+        """Column-wise ``detect_gender_salutation``.
+
+        Lowercasing and dot removal run over the whole column; each name's
+        tokens are then checked against ``FEMALE_INDICATORS``.
+        """
+        lowered = (
+            names.astype(str)
+            .str.lower()
+            .str.replace(".", " ", regex=False)
+            .fillna("")
+            .tolist()
+        )
+        return pd.Series(
+            [
+                "Sir" if FEMALE_INDICATORS.isdisjoint(name.split()) else "Madam"
+                for name in lowered
+            ],
+            index=names.index,
+            dtype=str,
+        )
 
-        # Check parts for indicators
-        parts = name_lower.replace(".", " ").split()
-        if any(part in female_indicators for part in parts):
-            return "Madam"
-        return "Sir"
+    def paid_mask(self, df: pd.DataFrame) -> pd.Series:
+        """True where the payment method marks the order as prepaid."""
+        payment_method_col = self.config.get("payment_method_col")
+        if not payment_method_col or payment_method_col not in df.columns:
+            return pd.Series(False, index=df.index)
+        return (
+            df[payment_method_col]
+            .astype(str)
+            .str.lower()
+            .str.contains(PAID_METHOD_PATTERN, regex=True, na=False)
+        )
 
     def _find_best_column(self, df_cols, target_keys, default):
         """Find the best matching column from a list of keys."""
-        cols_lower = [str(c).lower().strip() for c in df_cols]
-        for key in target_keys:
-            key_l = key.lower()
-            if key_l in cols_lower:
-                return df_cols[cols_lower.index(key_l)]
-        # Try partial match fallback
-        for key in target_keys:
-            key_l = key.lower()
-            for i, c_l in enumerate(cols_lower):
-                if key_l in c_l:
-                    return df_cols[i]
-        return default
-
-    def process_orders(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Process raw dataframe into grouped orders with fuzzy matching."""
-        df.columns = [str(col).strip() for col in df.columns]
-
-        # Fuzzy Match Configuration Columns
-        mapping = {
-            "phone_col": (
-                ["phone", "mobile", "contact", "billing phone"],
-                "Phone (Billing)",
-            ),
-            "name_col": (
-                ["full name", "billing name", "name", "first name", "customer"],
-                "Full Name (Billing)",
-            ),
-            "order_id_col": (["order id", "order #", "id", "order number"], "Order ID"),
-            "product_col": (
-                ["product name", "item name", "product", "item"],
-                "Product Name (main)",
-            ),
-            "sku_col": (["sku", "item sku", "code"], "SKU"),
-            "quantity_col": (["quantity", "qty", "item qty"], "Quantity"),
-            "price_col": (["item cost", "price", "cost"], "Item cost"),
-            "payment_method_col": (
-                ["payment method", "gateway"],
-                "Payment Method Title",
-            ),
-            "address_col": (
-                ["address", "shipping address", "billing address"],
-                "Address 1&2 (Billing)",
-            ),
-            "order_total_col": (
-                ["order total", "total amount", "total"],
-                "Order Total Amount",
-            ),
-            "city_col": (
-                ["city", "state", "zip", "location"],
-                "City, State, Zip (Billing)",
-            ),
+        return find_best_column(df_cols, target_keys, default)
+
+    def resolve_columns(self, columns) -> Dict:
+        """Update config with the best fuzzy match for every mapped column."""
+        for config_key, (targets, default) in COLUMN_ALIASES.items():
+            self.config[config_key] = self._find_best_column(columns, targets, default)
+        return self.config
+
+    def read_options(self, columns) -> Dict:
+        """``read_excel``/``read_csv`` kwargs that load only the mapped columns.
+
+        ``columns`` is the sheet's raw header (e.g. from an ``nrows`` preview).
+        Returns an empty dict when no mapped column is present.
+        """
+        columns = list(columns)
+        config = self.resolve_columns(columns)
+        usecols = [col for col in dict.fromkeys(config.values()) if col in columns]
+        if not usecols:
+            return {}
+        dtype = {
+            config[key]: "string" for key in TEXT_COLUMNS if config[key] in usecols
         }
+        return {"usecols": usecols, "dtype": dtype}
 
-        # Update config with whatever we find in the dataframe
-        for config_key, (targets, default) in mapping.items():
-            best_col = self._find_best_column(df.columns, targets, default)
-            self.config[config_key] = best_col
+    def process_orders(self, df: pd.DataFrame, join_items: bool = True) -> pd.DataFrame:
+        """Process raw dataframe into grouped orders with fuzzy matching.
+
+        With ``join_items=False`` the product/quantity/price columns stay as
+        per-order lists, which ``create_whatsapp_links`` consumes directly
+        and joins afterwards.
+        """
+        df.columns = df.columns.astype(str).str.strip()
+
+        self.resolve_columns(df.columns)
 
         # Validate core required columns are present
         required = ["phone_col", "name_col", "product_col"]
@@ -197,9 +581,9 @@ class WhatsAppOrderProcessor:
         phone_col = self.config["phone_col"]
 
         # Clean data
-        df[phone_col] = df[phone_col].apply(self.clean_phone_number)
-        df[self.config["name_col"]] = df[self.config["name_col"]].apply(
-            self.format_name
+        df[phone_col] = self.clean_phone_numbers(df[phone_col])
+        df[self.config["name_col"]] = self.format_text_series(
+            df[self.config["name_col"]]
         )
 
         # Clean and standardize product names
@@ -210,24 +594,24 @@ class WhatsAppOrderProcessor:
         for col_type in ["address_col", "city_col"]:
             col_name = self.config.get(col_type)
             if col_name and col_name in df.columns:
-                df[col_name] = df[col_name].apply(
-                    lambda x: self.format_text(str(x)) if pd.notna(x) else ""
-                )
+                df[col_name] = self.format_text_series(df[col_name])
 
         # SKU Integration
         sku_col = self.config.get("sku_col")
         if sku_col and sku_col in df.columns:
-            # Vectorized SKU integration for better performance
+            # One masked concatenation instead of two .loc writes
             p_series = df[product_col].fillna("").astype(str)
             s_series = df[sku_col].fillna("").astype(str)
-            
-            valid_sku = (s_series.str.strip() != "") & (s_series.str.lower() != "nan")
-            
-            df.loc[valid_sku, product_col] = p_series[valid_sku] + " - " + s_series[valid_sku]
-            df.loc[~valid_sku, product_col] = p_series[~valid_sku]
-
-        # Convert to Polars LazyFrame for optimized execution
-        lazy_df = pl.from_pandas(df).lazy()
+            valid_sku = s_series.str.strip().ne("") & s_series.str.lower().ne("nan")
+            df[product_col] = p_series.where(~valid_sku, p_series + " - " + s_series)
+
+        # Convert to Polars LazyFrame for optimized execution. The phone key is
+        # grouped (and joined) twice, so hash the strings once as a categorical.
+        lazy_df = (
+            pl.from_pandas(df)
+            .lazy()
+            .with_columns(pl.col(phone_col).cast(pl.String).cast(pl.Categorical))
+        )
         
         name_col = self.config["name_col"]
         order_id_col = self.config["order_id_col"]
@@ -237,11 +621,15 @@ class WhatsAppOrderProcessor:
 
         agg_exprs = [
             pl.col(name_col).first(),
-            pl.col(order_id_col).cast(pl.String).drop_nulls().unique().str.join(", "),
-            pl.col(product_col).cast(pl.String).drop_nulls().str.join("\n- "),
-            pl.col(quantity_col).cast(pl.String).drop_nulls().str.join("\n- "),
-            pl.col(price_col).cast(pl.String).drop_nulls().str.join("\n- "),
+            pl.col(order_id_col)
+            .cast(pl.String)
+            .drop_nulls()
+            .unique(maintain_order=True)
+            .str.join(", "),
         ]
+        for col in (product_col, quantity_col, price_col):
+            items = pl.col(col).cast(pl.String).drop_nulls()
+            agg_exprs.append(items.str.join(ITEM_SEP) if join_items else items)
 
         # Add optional columns to aggregation
         for key in ["address_col", "city_col", "payment_method_col"]:
@@ -254,10 +642,10 @@ class WhatsAppOrderProcessor:
         # Calculate correct total amount (sum of unique order totals per phone)
         total_col = self.config.get("order_total_col")
         if total_col and total_col in df.columns:
-            # Get one row per order to capture the Order Total once
+            # Collapse to one (phone, total) per order, then sum per phone
             totals_lazy = (
-                lazy_df.select([phone_col, order_id_col, total_col])
-                .unique(subset=[order_id_col])
+                lazy_df.group_by(order_id_col)
+                .agg(pl.col(phone_col).first(), pl.col(total_col).first())
                 .group_by(phone_col)
                 .agg(pl.col(total_col).sum())
             )
@@ -265,13 +653,20 @@ class WhatsAppOrderProcessor:
             grouped_lazy = grouped_lazy.join(totals_lazy, on=phone_col, how="left")
 
         # Execute query graph and convert back to Pandas
-        return grouped_lazy.collect().to_pandas()
+        return (
+            grouped_lazy.with_columns(pl.col(phone_col).cast(pl.String))
+            .collect()
+            .to_pandas()
+        )
 
     def create_whatsapp_links(
         self, df: pd.DataFrame, custom_template: str = None
     ) -> pd.DataFrame:
-        """Generate formatted WhatsApp messages and links."""
-        whatsapp_links = []
+        """Generate formatted WhatsApp messages and links.
+
+        ``df`` is the output of ``process_orders``, whose names, addresses
+        and cities are already formatted and are used as they are.
+        """
         order_summaries = []
         phone_col = self.config["phone_col"]
         name_col = self.config["name_col"]
@@ -282,105 +677,92 @@ class WhatsAppOrderProcessor:
         quantity_col = self.config["quantity_col"]
         price_col = self.config["price_col"]
         order_total_col = self.config["order_total_col"]
-        payment_method_col = self.config.get("payment_method_col")
-
-        for row in df.to_dict("records"):
-            phone = row.get(phone_col, "")
+        template = custom_template or DEFAULT_MESSAGE_TEMPLATE
+        # Repeat customers share a salutation; detect it once per distinct name
+        # and map the whole column, instead of resolving it inside the loop.
+        salutations = ["Sir"] * len(df)
+        if name_col in df.columns:
+            names = pd.Series(df[name_col].dropna().unique(), dtype=object)
+            by_name = dict(zip(names, self.detect_gender_salutations(names)))
+            salutations = df[name_col].map(by_name).fillna("Sir").tolist()
+
+        phones = _column_list(df, phone_col, "")
+        # Format every order total once, column-wise, instead of per message.
+        totals = pd.Series(_column_list(df, order_total_col, 0.0), dtype=float)
+        total_strs = (
+            totals.map("{:.2f} BDT".format).astype(object)
+            + np.where(self.paid_mask(df).to_numpy(), " (PAID)", "")
+        ).tolist()
+        summary_totals = totals.map("{:.0f}".format).tolist()
+        message_values = {
+            key: []
+            for key in ("name", "salutation", "order_id", "products_list", "total", "address")
+        }
+        # Products, quantities and prices as per-order item lists, converted
+        # once and reused for both the messages and the display columns.
+        item_columns = (product_col, quantity_col, price_col)
+        items = [
+            [_item_list(value) for value in _column_list(df, col, "")]
+            for col in item_columns
+        ]
+        rows = zip(
+            phones,
+            _column_list(df, name_col, ""),
+            salutations,
+            _column_list(df, order_id_col, ""),
+            # process_orders already formatted address and city; only join them
+            self.format_address_series(
+                pd.Series(_column_list(df, address_col, ""), index=df.index, dtype=object),
+                pd.Series(_column_list(df, city_col, ""), index=df.index, dtype=object),
+                preformatted=True,
+            ).tolist(),
+            *items,
+            total_strs,
+            summary_totals,
+        )
+        for (
+            phone,
+            name,
+            salutation,
+            order_id,
+            formatted_address,
+            products,
+            quantities,
+            prices,
+            total_str,
+            summary_total,
+        ) in rows:
             if not phone:
-                whatsapp_links.append(None)
                 order_summaries.append(None)
                 continue
 
-            # Determine Salutation
-            name = row.get(name_col, "")
-            salutation = self.detect_gender_salutation(name)
-            order_id = str(row.get(order_id_col, ""))
+            order_id = str(order_id)
 
-            # Format Address
-            formatted_address = self.format_address(
-                row.get(address_col, ""),
-                row.get(city_col, ""),
-            )
+            products_str = _item_lines(products, quantities, prices)
 
-            # Build Product List & Totals for template use
-            product_list = []
-            products = str(row.get(product_col, "")).split("\n- ")
-            quantities = str(row.get(quantity_col, "")).split("\n- ")
-            prices = str(row.get(price_col, "")).split("\n- ")
-
-            for i, prod in enumerate(products):
-                item_line = f"- {prod.strip()}"
-                if i < len(quantities):
-                    item_line += f" - Qty: {quantities[i].strip()}"
-                if i < len(prices):
-                    item_line += f" - Price: {prices[i].strip()} BDT"
-                product_list.append(item_line)
-
-            products_str = "\n".join(product_list)
-
-            total_amount = float(row.get(order_total_col, 0.0))
-            collectable_amount = total_amount
-            is_paid = False
-            
-            payment_method = row.get(payment_method_col)
-            if payment_method and pd.notna(payment_method):
-                method = str(payment_method).lower()
-                if any(x in method for x in ["bkash", "online", "ssl", "paid"]):
-                    collectable_amount = 0
-                    is_paid = True
-
-            total_str = f"{total_amount:.2f} BDT"
-            if is_paid:
-                total_str += " (PAID)"
-            elif collectable_amount != total_amount:
-                total_str += f" (Collectable: {collectable_amount:.2f} BDT)"
-
-            if custom_template:
-                message = (
-                    custom_template.replace("{name}", str(name))
-                    .replace("{salutation}", salutation)
-                    .replace("{order_id}", order_id)
-                    .replace("{products_list}", products_str)
-                    .replace("{total}", total_str)
-                    .replace("{address}", formatted_address)
-                )
-            else:
-                lines = [
-                    f"*Order Verification From DEEN Commerce*",
-                    "",
-                    f"Assalamu Alaikum, {salutation}!",
-                    "",
-                    f"Dear {name},",
-                    "",
-                    "Please verify your order details:",
-                    "",
-                    f"*Order ID:* {order_id}",
-                    "",
-                    "*Your Order:*",
-                    products_str,
-                    "",
-                    f"*Total Amount:* {total_str}",
-                    "",
-                    "*Shipping Address:*",
-                    formatted_address,
-                    "",
-                    "Please confirm the order and address.",
-                    "If any correction is needed, please let us know the possible adjustment.",
-                    "",
-                    "*Delivery fees apply for returns.*",
-                    "",
-                    "Thank you for shopping with DEEN Commerce! Grab our latest collection on: https://deencommerce.com/",
-                ]
-                message = "\n".join(lines)
-            
-            encoded_message = urllib.parse.quote(message)
-            whatsapp_links.append(f"https://wa.me/+88{phone}?text={encoded_message}")
+            message_values["name"].append(str(name))
+            message_values["salutation"].append(salutation)
+            message_values["order_id"].append(order_id)
+            message_values["products_list"].append(products_str)
+            message_values["total"].append(total_str)
+            message_values["address"].append(formatted_address)
 
             # Simple Summary for copy-pasting
-            summary_parts = [prod.strip() for prod in products]
-            summary_text = f"Order {order_id}: " + ", ".join(summary_parts)
-            summary_text += f" | Total: {total_amount:.0f} BDT"
-            order_summaries.append(summary_text)
+            summary_items = ", ".join([prod.strip() for prod in products])
+            order_summaries.append(
+                f"Order {order_id}: {summary_items} | Total: {summary_total} BDT"
+            )
+
+        messages = iter(encode_messages(template, message_values))
+        numbers = self.whatsapp_numbers(pd.Series(phones, dtype=object))
+        whatsapp_links = [
+            f"https://wa.me/+{number}?text={next(messages)}" if phone else None
+            for phone, number in zip(phones, numbers.tolist())
+        ]
+
+        for col, col_items in zip(item_columns, items):
+            if col in df.columns and len(df) and _is_item_list(df[col].iloc[0]):
+                df[col] = [ITEM_SEP.join(order_items) for order_items in col_items]
 
         df["whatsapp_link"] = whatsapp_links
         df["order_summary"] = order_summaries
@@ -1,6 +1,79 @@
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+
 import pandas as pd
+import polars as pl
 import streamlit as st
-from io import BytesIO
+
+try:
+    from python_calamine import CalamineError
+except ImportError:  # python-calamine missing; pandas raises ImportError then.
+    CalamineError = ValueError
+
+try:
+    from fastexcel import FastExcelError
+except ImportError:  # fastexcel missing; polars raises ImportError then.
+    FastExcelError = ValueError
+
+
+# Set USE_POLARS_EXCEL=0 to skip the polars reader and always parse with pandas.
+USE_POLARS_EXCEL = os.getenv("USE_POLARS_EXCEL", "1") == "1"
+_POLARS_READ_KWARGS = {"nrows", "usecols", "dtype"}
+
+
+def _read_excel_polars(file_obj, nrows=None, usecols=None, dtype=None) -> pd.DataFrame:
+    """Parses the first sheet with polars and hands back a pandas frame.
+
+    The frame comes back NumPy-backed with NaN for blanks, as pandas' own
+    reader returns it; pages test cells with ``or``/``pd.isna`` and would
+    trip over ``pd.NA``. Column types are inferred from every row, so a
+    text value far down a numeric column (an "A-77" order number) turns the
+    column into text instead of being read as null. Only ``"string"`` dtype
+    overrides are translated; anything else raises ValueError so the caller
+    falls back.
+    """
+    schema_overrides = None
+    if dtype:
+        if any(str(kind) != "string" for kind in dtype.values()):
+            raise ValueError("unsupported dtype override for polars reader")
+        schema_overrides = {col: pl.String for col in dtype}
+    df = pl.read_excel(
+        file_obj,
+        engine="calamine",
+        columns=list(usecols) if usecols is not None else None,
+        read_options={"n_rows": nrows} if nrows is not None else None,
+        schema_overrides=schema_overrides,
+        infer_schema_length=None,
+        drop_empty_rows=False,
+    )
+    return df.to_pandas()
+
+
+def read_excel(file_obj, **kwargs) -> pd.DataFrame:
+    """Reads an Excel workbook, fastest available engine first.
+
+    Tries polars (needs fastexcel) when enabled and the arguments map onto
+    it, then pandas' calamine engine, then the default openpyxl engine.
+    """
+    if USE_POLARS_EXCEL and set(kwargs) <= _POLARS_READ_KWARGS:
+        try:
+            return _read_excel_polars(file_obj, **kwargs)
+        except (ImportError, ValueError, pl.exceptions.PolarsError, FastExcelError):
+            # fastexcel missing, a workbook it rejects, or arguments the
+            # polars reader can't honor.
+            if hasattr(file_obj, "seek"):
+                file_obj.seek(0)
+    try:
+        return pd.read_excel(file_obj, engine="calamine", **kwargs)
+    except (ImportError, ValueError, CalamineError):
+        # python-calamine missing or the workbook is a format it rejects;
+        # calamine's own errors don't subclass ValueError.
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+        return pd.read_excel(file_obj, **kwargs)
 
 
 @st.cache_data(show_spinner=False)
@@ -8,22 +81,171 @@ def read_sales_file(file_obj, file_name):
     """Reads CSV/XLSX from uploader, file path, or bytes buffer."""
     if str(file_name).lower().endswith(".csv"):
         return pd.read_csv(file_obj)
-    return pd.read_excel(file_obj)
+    return read_excel(file_obj)
 
 
-def read_uploaded(uploaded_file):
+@contextmanager
+def spooled_upload_path(file_bytes: bytes, suffix: str = ".xlsx"):
+    """Writes upload bytes to a temp file and yields its path.
+
+    Letting the Excel engine open a path avoids wrapping yet another
+    in-memory copy of the workbook around the uploader's buffer.
+    """
+    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    try:
+        with tmp:
+            tmp.write(file_bytes)
+        yield tmp.name
+    finally:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+
+
+def _parse_upload(file_bytes: bytes, file_name: str, **read_kwargs) -> pd.DataFrame:
+    if file_name.lower().endswith(".csv"):
+        return pd.read_csv(BytesIO(file_bytes), **read_kwargs)
+    with spooled_upload_path(file_bytes, os.path.splitext(file_name)[1] or ".xlsx") as path:
+        return read_excel(path, **read_kwargs)
+
+
+@st.cache_data(show_spinner=False)
+def _parse_upload_bytes(file_bytes: bytes, file_name: str, nrows: int | None = None) -> pd.DataFrame:
+    """Parses raw upload bytes; cached so widget reruns skip the re-parse."""
+    return _parse_upload(file_bytes, file_name, nrows=nrows)
+
+
+def read_uploaded(uploaded_file, nrows: int | None = None):
     """Generic file reader for uploaded files."""
     if not uploaded_file:
         return None
     uploaded_file.seek(0)
-    if uploaded_file.name.lower().endswith(".csv"):
-        return pd.read_csv(uploaded_file)
-    return pd.read_excel(uploaded_file)
+    return _parse_upload_bytes(uploaded_file.getvalue(), uploaded_file.name, nrows)
+
+
+_PARSE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="upload-parse")
+
+
+def read_uploaded_async(uploaded_file, **read_kwargs) -> Future:
+    """Starts a full parse of an upload on a worker thread.
+
+    Lets a page render its preview and column checks while a large sheet is
+    still parsing; call ``.result()`` only where the full frame is needed.
+    ``read_kwargs`` (e.g. ``usecols``/``dtype``) go straight to the reader.
+    The worker bypasses st.cache_data, so keep the future in session state
+    to reuse it across reruns.
+    """
+    uploaded_file.seek(0)
+    return _PARSE_POOL.submit(
+        _parse_upload, uploaded_file.getvalue(), uploaded_file.name, **read_kwargs
+    )
+
+
+WIDTH_SAMPLE_ROWS = 2000
+
+
+def excel_writer(output) -> pd.ExcelWriter:
+    """xlsxwriter-backed ``ExcelWriter`` for an in-memory export.
+
+    The workbook parts are assembled in memory instead of through temporary
+    files, since the result is headed for a ``BytesIO`` anyway. Row-streaming
+    (xlsxwriter's ``constant_memory``, like openpyxl's write-only mode) is
+    not an option here: ``DataFrame.to_excel`` writes column by column, and
+    in that mode every cell behind the current row is silently dropped.
+    """
+    return pd.ExcelWriter(
+        output, engine="xlsxwriter", engine_kwargs={"options": {"in_memory": True}}
+    )
+
+
+# Shared header style for xlsxwriter exports; add it once per workbook.
+EXCEL_HEADER_STYLE = {
+    "bold": True,
+    "bg_color": "#4F81BD",
+    "font_color": "white",
+    "border": 1,
+}
+
+
+def excel_column_width(
+    series: pd.Series, header, padding: int = 2, cap: int = 50
+) -> int:
+    """Column width from the longest header/value, capped at ``cap``.
+
+    Integer columns are sized from their min/max; other long columns are
+    measured on a fixed random sample rather than every cell, which is
+    plenty to size a column.
+    """
+    values = series.dropna()
+    if values.empty:
+        max_val_len = 0
+    elif pd.api.types.is_integer_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        # The widest integer is always the min or the max; no string pass needed.
+        max_val_len = max(len(str(values.min())), len(str(values.max())))
+    else:
+        if len(values) > WIDTH_SAMPLE_ROWS:
+            values = values.sample(WIDTH_SAMPLE_ROWS, random_state=0)
+        max_val_len = int(values.astype(str).str.len().max())
+    return min(max(max_val_len, len(str(header))) + padding, cap)
+
+
+def style_header_row(ws, df: pd.DataFrame, header_format, **width_kwargs) -> None:
+    """Rewrites ``ws``'s header row in ``header_format`` and sizes every column.
+
+    Add ``header_format`` once per workbook (from ``EXCEL_HEADER_STYLE``) and
+    pass the same instance for every sheet. ``width_kwargs`` go to
+    ``excel_column_width``.
+    """
+    ws.write_row(0, 0, [str(col) for col in df.columns], header_format)
+    size_columns(ws, df, **width_kwargs)
+
+
+def size_columns(ws, df: pd.DataFrame, **width_kwargs) -> None:
+    """Sets every column width of ``ws`` from ``df`` (see ``excel_column_width``).
+
+    Widths come from the frame, so no worksheet cells are read back.
+    """
+    for idx, col in enumerate(df.columns):
+        # Positional, so a repeated header still sizes a single column.
+        ws.set_column(idx, idx, excel_column_width(df.iloc[:, idx], col, **width_kwargs))
+
+
+# Excel rejects hyperlinks longer than this; xlsxwriter would drop the cell.
+EXCEL_MAX_URL_LEN = 2079
+
+
+def write_url_column(ws, df: pd.DataFrame, col) -> None:
+    """Writes ``df[col]`` as hyperlinks under the header row of ``ws``.
+
+    Write the frame with that column blanked (e.g. ``df.assign(col=None)``)
+    so each cell is written once. Links too long for Excel stay plain text.
+    """
+    col_idx = df.columns.get_loc(col)
+    for row_idx, url in enumerate(df[col].tolist(), start=1):
+        if not isinstance(url, str) or not url:
+            continue
+        if len(url) <= EXCEL_MAX_URL_LEN:
+            ws.write_url(row_idx, col_idx, url)
+        else:
+            ws.write_string(row_idx, col_idx, url)
+
 
+def to_excel_bytes(
+    df: pd.DataFrame, sheet_name: str = "Sheet1", url_columns=()
+) -> bytes:
+    """Serializes ``df`` to xlsx bytes with columns sized to their contents.
 
-def to_excel_bytes(df: pd.DataFrame, sheet_name: str = "Sheet1") -> bytes:
+    ``url_columns`` are written once, as hyperlinks (see ``write_url_column``).
+    """
+    url_columns = [col for col in url_columns if col in df.columns]
     output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
-    output.seek(0)
-    return output.read()
+    with excel_writer(output) as writer:
+        df.assign(**{col: None for col in url_columns}).to_excel(
+            writer, index=False, sheet_name=sheet_name
+        )
+        ws = writer.sheets[sheet_name]
+        for col in url_columns:
+            write_url_column(ws, df, col)
+        size_columns(ws, df)
+    return output.getvalue()
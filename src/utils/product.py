@@ -1,6 +1,7 @@
 import functools
 
 
+@functools.lru_cache(maxsize=4096)
 def get_base_product_name(name: str) -> str:
     """Removes the size portion (e.g. ' - XL') from a product name for cleaner filter grouping."""
     if not name or " - " not in name:
@@ -8,6 +9,7 @@ def get_base_product_name(name: str) -> str:
     return str(name).rsplit(" - ", 1)[0]
 
 
+@functools.lru_cache(maxsize=4096)
 def get_size_from_name(name: str) -> str:
     """Extracts the size attribute from a product name string."""
     if not name or " - " not in name:
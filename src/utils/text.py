@@ -3,6 +3,78 @@ from functools import lru_cache
 
 
 # --- Address Logic ---
+# ISO 3166-2:BD District Mappings (standard for WooCommerce BD)
+BD_STATES = {
+    "BD-01": "Bandarban",
+    "BD-02": "Barguna",
+    "BD-03": "Bogura",           # Corrected from "Bogra"
+    "BD-04": "Brahmanbaria",
+    "BD-05": "Bagerhat",
+    "BD-06": "Barishal",         # Corrected from "Barisal"
+    "BD-07": "Bhola",
+    "BD-08": "Cumilla",          # Updated official spelling
+    "BD-09": "Chandpur",
+    "BD-10": "Chattogram",       # Official name (was Chittagong)
+    "BD-11": "Cox's Bazar",
+    "BD-12": "Chuadanga",
+    "BD-13": "Dhaka",
+    "BD-14": "Dinajpur",
+    "BD-15": "Faridpur",
+    "BD-16": "Feni",
+    "BD-17": "Gopalganj",
+    "BD-18": "Gazipur",
+    "BD-19": "Gaibandha",
+    "BD-20": "Habiganj",
+    "BD-21": "Jamalpur",
+    "BD-22": "Jashore",          # Updated official spelling
+    "BD-23": "Jhenaidah",
+    "BD-24": "Joypurhat",
+    "BD-25": "Jhalokathi",
+    "BD-26": "Kishoreganj",
+    "BD-27": "Khulna",
+    "BD-28": "Kurigram",
+    "BD-29": "Khagrachhari",
+    "BD-30": "Kushtia",
+    "BD-31": "Lakshmipur",
+    "BD-32": "Lalmonirhat",
+    "BD-33": "Manikganj",
+    "BD-34": "Mymensingh",
+    "BD-35": "Munshiganj",
+    "BD-36": "Madaripur",
+    "BD-37": "Magura",
+    "BD-38": "Moulvibazar",
+    "BD-39": "Meherpur",
+    "BD-40": "Narayanganj",
+    "BD-41": "Netrakona",
+    "BD-42": "Narsingdi",
+    "BD-43": "Narail",
+    "BD-44": "Natore",
+    "BD-45": "Chapai Nawabganj",  # Fixed: This is the official district name
+    "BD-46": "Nilphamari",
+    "BD-47": "Noakhali",
+    "BD-48": "Naogaon",
+    "BD-49": "Pabna",
+    "BD-50": "Pirojpur",
+    "BD-51": "Patuakhali",
+    "BD-52": "Panchagarh",
+    "BD-53": "Rajbari",
+    "BD-54": "Rajshahi",
+    "BD-55": "Rangpur",
+    "BD-56": "Rangamati",
+    "BD-57": "Sherpur",
+    "BD-58": "Satkhira",
+    "BD-59": "Sirajganj",
+    "BD-60": "Sylhet",
+    "BD-61": "Sunamganj",
+    "BD-62": "Shariatpur",
+    "BD-63": "Tangail",
+    "BD-64": "Thakurgaon"
+}
+
+# Same mapping keyed by the dash-less code (e.g. BD13) for one-step lookups
+_BD_STATES_COMPACT = {k.replace("-", ""): v for k, v in BD_STATES.items()}
+
+
 @lru_cache(maxsize=4096)
 def normalize_city_name(city_name):
     """
@@ -14,86 +86,10 @@ def normalize_city_name(city_name):
     c = city_name.strip()
     c_lower = c.lower()
 
-    # ISO 3166-2:BD District Mappings (standard for WooCommerce BD)
-    # ISO 3166-2:BD District Mappings (standard for WooCommerce BD)
-    bd_states = {
-        "BD-01": "Bandarban",
-        "BD-02": "Barguna",
-        "BD-03": "Bogura",           # Corrected from "Bogra"
-        "BD-04": "Brahmanbaria",
-        "BD-05": "Bagerhat",
-        "BD-06": "Barishal",         # Corrected from "Barisal"
-        "BD-07": "Bhola",
-        "BD-08": "Cumilla",          # Updated official spelling
-        "BD-09": "Chandpur",
-        "BD-10": "Chattogram",       # Official name (was Chittagong)
-        "BD-11": "Cox's Bazar",
-        "BD-12": "Chuadanga",
-        "BD-13": "Dhaka",
-        "BD-14": "Dinajpur",
-        "BD-15": "Faridpur",
-        "BD-16": "Feni",
-        "BD-17": "Gopalganj",
-        "BD-18": "Gazipur",
-        "BD-19": "Gaibandha",
-        "BD-20": "Habiganj",
-        "BD-21": "Jamalpur",
-        "BD-22": "Jashore",          # Updated official spelling
-        "BD-23": "Jhenaidah",
-        "BD-24": "Joypurhat",
-        "BD-25": "Jhalokathi",
-        "BD-26": "Kishoreganj",
-        "BD-27": "Khulna",
-        "BD-28": "Kurigram",
-        "BD-29": "Khagrachhari",
-        "BD-30": "Kushtia",
-        "BD-31": "Lakshmipur",
-        "BD-32": "Lalmonirhat",
-        "BD-33": "Manikganj",
-        "BD-34": "Mymensingh",
-        "BD-35": "Munshiganj",
-        "BD-36": "Madaripur",
-        "BD-37": "Magura",
-        "BD-38": "Moulvibazar",
-        "BD-39": "Meherpur",
-        "BD-40": "Narayanganj",
-        "BD-41": "Netrakona",
-        "BD-42": "Narsingdi",
-        "BD-43": "Narail",
-        "BD-44": "Natore",
-        "BD-45": "Chapai Nawabganj",  # Fixed: This is the official district name
-        "BD-46": "Nilphamari",
-        "BD-47": "Noakhali",
-        "BD-48": "Naogaon",
-        "BD-49": "Pabna",
-        "BD-50": "Pirojpur",
-        "BD-51": "Patuakhali",
-        "BD-52": "Panchagarh",
-        "BD-53": "Rajbari",
-        "BD-54": "Rajshahi",
-        "BD-55": "Rangpur",
-        "BD-56": "Rangamati",
-        "BD-57": "Sherpur",
-        "BD-58": "Satkhira",
-        "BD-59": "Sirajganj",
-        "BD-60": "Sylhet",
-        "BD-61": "Sunamganj",
-        "BD-62": "Shariatpur",
-        "BD-63": "Tangail",
-        "BD-64": "Thakurgaon"
-    }
-
-    c_upper = c.upper()
-    if c_upper in bd_states:
-        return bd_states[c_upper]
-
-    # Generic prefix match (e.g. BD13)
-    c_clean = c_upper.replace("-", "").strip()
-    if c_clean.startswith("BD") and c_clean in [k.replace("-", "") for k in bd_states]:
-        # Map cleaned code to state
-        for k, v in bd_states.items():
-            if k.replace("-", "") == c_clean:
-                return v
+    # ISO 3166-2:BD codes, with or without the dash (BD-13 / BD13)
+    state = _BD_STATES_COMPACT.get(c.upper().replace("-", "").strip())
+    if state:
+        return state
 
     # User requested mappings
     if "brahmanbaria" in c_lower:
@@ -115,6 +111,24 @@ def normalize_city_name(city_name):
     return c.title()
 
 
+# Priority Zones (Common Pathao targets)
+PRIORITY_ZONES = [
+    "Mirpur", "Uttara", "Gulshan", "Banani", "Dhanmondi", "Mohammadpur",
+    "Badda", "Rampura", "Khilgaon", "Jatrabari", "Demra", "Hazaribagh",
+    "Kamrangirchar", "Kotwali", "Lalbagh", "Motijheel", "Paltan", "Ramna",
+    "Sabujbagh", "Shahbagh", "Sher-E-Bangla Nagar", "Sutrapur", "Tejgaon",
+    "Tejgaon Industrial Area", "Uttara West", "Uttara East", "Pallabi",
+    "Kafrul", "Cantonment", "Basundhara", "Baridhara", "Nikunja", "Khilkhet",
+    "Bashundhara R/A", "Mohakhali", "Malibagh", "Moghbazar", "Farmgate",
+    "Savar", "Gazipur", "Narayanganj", "Keraniganj", "Tongi", "Ashulia",
+    "Pahartali", "Halishahar", "Patenga", "Bakalia", "Panchlaish", "Bayezid",
+    "Chandgaon", "Double Mooring", "Khulshi"
+]
+_ZONE_PATTERNS = tuple(
+    (zone, re.compile(rf"\b{re.escape(zone.lower())}\b")) for zone in PRIORITY_ZONES
+)
+
+
 @lru_cache(maxsize=4096)
 def peek_zone_from_address(address: str, current_city: str = "") -> str:
     """
@@ -125,22 +139,8 @@ def peek_zone_from_address(address: str, current_city: str = "") -> str:
 
     addr = str(address).lower()
 
-    # Priority Zones (Common Pathao targets)
-    zones = [
-        "Mirpur", "Uttara", "Gulshan", "Banani", "Dhanmondi", "Mohammadpur",
-        "Badda", "Rampura", "Khilgaon", "Jatrabari", "Demra", "Hazaribagh",
-        "Kamrangirchar", "Kotwali", "Lalbagh", "Motijheel", "Paltan", "Ramna",
-        "Sabujbagh", "Shahbagh", "Sher-E-Bangla Nagar", "Sutrapur", "Tejgaon",
-        "Tejgaon Industrial Area", "Uttara West", "Uttara East", "Pallabi",
-        "Kafrul", "Cantonment", "Basundhara", "Baridhara", "Nikunja", "Khilkhet",
-        "Bashundhara R/A", "Mohakhali", "Malibagh", "Moghbazar", "Farmgate",
-        "Savar", "Gazipur", "Narayanganj", "Keraniganj", "Tongi", "Ashulia",
-        "Pahartali", "Halishahar", "Patenga", "Bakalia", "Panchlaish", "Bayezid",
-        "Chandgaon", "Double Mooring", "Khulshi"
-    ]
-
-    for zone in zones:
-        if re.search(rf"\b{re.escape(zone.lower())}\b", addr):
+    for zone, pattern in _ZONE_PATTERNS:
+        if pattern.search(addr):
             return zone
 
     return ""
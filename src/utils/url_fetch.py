@@ -7,6 +7,8 @@ from io import BytesIO, StringIO
 import pandas as pd
 import requests
 
+from src.utils.file_io import read_excel
+
 
 def fetch_dataframe_from_url(url: str, timeout: int = 15) -> pd.DataFrame:
     """Fetch a DataFrame from a public CSV or XLSX URL.
@@ -47,6 +49,6 @@ def fetch_dataframe_from_url(url: str, timeout: int = 15) -> pd.DataFrame:
 
     # Try Excel first, fall back to CSV
     try:
-        return pd.read_excel(BytesIO(resp.content))
+        return read_excel(BytesIO(resp.content))
     except Exception:
         return pd.read_csv(StringIO(resp.text))
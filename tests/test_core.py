@@ -72,3 +72,20 @@ def test_add_stock_columns():
     assert res.loc[1, "Store2"] == 10
 
     assert len(res) == 3
+
+
+def test_add_title_size_column():
+    df = pd.DataFrame(
+        {
+            "Title": ["Shirt", "Cap", None, 101.0],
+            "Size": ["m", "no size", "L", 42.0],
+        }
+    )
+
+    res = inv_core.add_title_size_column(df, title_col="Title", size_col="Size")
+
+    assert res["Title - Size"].tolist() == ["Shirt - M", "Cap", "", "101 - 42"]
+    assert "Title - Size" not in df.columns
+
+    no_size = inv_core.add_title_size_column(df, title_col="Title", size_col=None)
+    assert no_size["Title - Size"].tolist() == ["Shirt", "Cap", "", "101"]
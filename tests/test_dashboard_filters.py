@@ -0,0 +1,52 @@
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+
+def _identity_decorator(*args, **kwargs):
+    def decorator(func):
+        return func
+
+    return decorator
+
+
+fake_streamlit = types.ModuleType("streamlit")
+fake_streamlit.session_state = {}
+fake_streamlit.secrets = {}
+fake_streamlit.cache_data = _identity_decorator
+fake_streamlit.cache_resource = _identity_decorator
+sys.modules["streamlit"] = fake_streamlit
+
+from src.pages import dashboard_filters
+
+
+def test_map_distinct_matches_apply_and_calls_once_per_value():
+    calls = []
+
+    def categorize(name):
+        calls.append(name)
+        return "Missing" if pd.isna(name) else name.split(" - ")[0]
+
+    names = pd.Series(
+        ["Polo Shirt - L", None, "Jeans - 32", "Polo Shirt - L", float("nan"), "Jeans - 32"],
+        index=[5, 5, 7, 8, 9, 10],
+        dtype=object,
+    )
+    expected = names.apply(categorize).tolist()
+    calls.clear()
+
+    result = dashboard_filters._map_distinct(names, categorize)
+
+    assert result.tolist() == expected
+    assert result.index.equals(names.index)
+    assert [c for c in calls if not pd.isna(c)] == ["Polo Shirt - L", "Jeans - 32"]
+
+
+def test_map_distinct_with_size_lookup():
+    names = pd.Series(["Polo Shirt - L", "Cap", "Polo Shirt - L"])
+    result = dashboard_filters._map_distinct(names, dashboard_filters.get_size_from_name)
+    assert result.tolist() == names.apply(dashboard_filters.get_size_from_name).tolist()
@@ -0,0 +1,205 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from io import BytesIO
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.utils.file_io import (
+    EXCEL_HEADER_STYLE,
+    CalamineError,
+    excel_column_width,
+    read_excel,
+    read_uploaded,
+    read_uploaded_async,
+    spooled_upload_path,
+    style_header_row,
+    to_excel_bytes,
+)
+
+
+class TestReadExcel:
+    def test_round_trip(self):
+        df = pd.DataFrame({"Order ID": [1, 2], "Phone (Billing)": ["017", "018"]})
+        res = read_excel(BytesIO(to_excel_bytes(df)))
+        assert list(res.columns) == ["Order ID", "Phone (Billing)"]
+        assert len(res) == 2
+
+    def test_falls_back_when_calamine_unavailable(self):
+        df = pd.DataFrame({"a": [1]})
+        buf = BytesIO(to_excel_bytes(df))
+        real_read_excel = pd.read_excel
+
+        def fake_read_excel(file_obj, **kwargs):
+            if kwargs.get("engine") == "calamine":
+                file_obj.read()
+                raise ImportError("python-calamine not installed")
+            return real_read_excel(file_obj, **kwargs)
+
+        with patch("src.utils.file_io.pd.read_excel", side_effect=fake_read_excel), patch(
+            "src.utils.file_io.USE_POLARS_EXCEL", False
+        ):
+            res = read_excel(buf)
+        assert res["a"].tolist() == [1]
+
+    def test_falls_back_when_calamine_rejects_workbook(self):
+        df = pd.DataFrame({"a": [1]})
+        buf = BytesIO(to_excel_bytes(df))
+        real_read_excel = pd.read_excel
+
+        def fake_read_excel(file_obj, **kwargs):
+            if kwargs.get("engine") == "calamine":
+                file_obj.read()
+                raise CalamineError("Cannot detect file format")
+            return real_read_excel(file_obj, **kwargs)
+
+        with patch("src.utils.file_io.pd.read_excel", side_effect=fake_read_excel), patch(
+            "src.utils.file_io.USE_POLARS_EXCEL", False
+        ):
+            res = read_excel(buf)
+        assert res["a"].tolist() == [1]
+
+    def test_polars_reader_matches_pandas_on_blanks_and_mixed_types(self):
+        pytest.importorskip("fastexcel")
+        from src.processing.order_processor import process_orders_dataframe
+
+        rows = 150
+        df = pd.DataFrame(
+            {
+                # Text order number well past polars' default inference window
+                "Order Number": [1001 + i for i in range(rows - 1)] + ["A-77"],
+                "Phone (Billing)": [f"017{i:08d}" for i in range(rows)],
+                "State Name (Billing)": [None] + ["Dhaka"] * (rows - 1),
+                "Address 1&2 (Billing)": [None] + ["House 1, Mirpur"] * (rows - 1),
+                "Quantity": [1] * rows,
+            }
+        )
+        buf = BytesIO(to_excel_bytes(df))
+
+        with patch("src.utils.file_io.USE_POLARS_EXCEL", True):
+            res = read_excel(buf)
+
+        assert res["Order Number"].astype(str).tolist()[-2:] == ["1149", "A-77"]
+        assert pd.isna(res.loc[0, "State Name (Billing)"])
+        assert res.loc[0, "State Name (Billing)"] is not pd.NA
+        assert len(process_orders_dataframe(res)) == rows
+
+    def test_falls_back_when_polars_reader_unavailable(self):
+        df = pd.DataFrame({"Order ID": ["1001", "1002"]})
+        buf = BytesIO(to_excel_bytes(df))
+        with patch(
+            "src.utils.file_io._read_excel_polars",
+            side_effect=ImportError("fastexcel not installed"),
+        ):
+            res = read_excel(buf, nrows=1)
+        assert res["Order ID"].astype(str).tolist() == ["1001"]
+
+
+class TestReadUploaded:
+    def test_none_returns_none(self):
+        assert read_uploaded(None) is None
+
+    def test_reads_csv_upload(self):
+        upload = BytesIO(b"a,b\n1,2\n")
+        upload.name = "orders.CSV"
+        res = read_uploaded(upload)
+        assert res.to_dict("records") == [{"a": 1, "b": 2}]
+
+    def test_reads_xlsx_upload(self):
+        upload = BytesIO(to_excel_bytes(pd.DataFrame({"a": [1, 2]})))
+        upload.name = "orders.xlsx"
+        assert read_uploaded(upload)["a"].tolist() == [1, 2]
+
+
+class TestSpooledUploadPath:
+    def test_temp_file_removed_after_use(self):
+        with spooled_upload_path(b"payload", ".csv") as path:
+            assert path.endswith(".csv")
+            with open(path, "rb") as fh:
+                assert fh.read() == b"payload"
+        assert not os.path.exists(path)
+
+
+class TestReadUploadedAsync:
+    def test_future_resolves_to_full_frame(self):
+        upload = BytesIO(to_excel_bytes(pd.DataFrame({"a": range(120)})))
+        upload.name = "orders.xlsx"
+        future = read_uploaded_async(upload)
+        assert len(future.result(timeout=30)) == 120
+        assert len(read_uploaded(upload, nrows=5)) == 5
+
+
+class TestExcelColumnWidth:
+    def test_header_or_value_wins_and_cap_applies(self):
+        s = pd.Series(["abc", None, "abcdefgh"])
+        assert excel_column_width(s, "id") == 10
+        assert excel_column_width(s, "a much longer header") == 22
+        assert excel_column_width(pd.Series(["x" * 200]), "h") == 50
+
+    def test_empty_column_uses_header(self):
+        assert excel_column_width(pd.Series([], dtype=object), "Phone") == 7
+
+    def test_integer_column_sized_from_extremes(self):
+        s = pd.Series([5, -123456, 42, 99999])
+        assert excel_column_width(s, "n") == len("-123456") + 2
+
+
+class TestToExcelBytes:
+    def test_url_columns_keep_links_past_excel_limit(self):
+        import openpyxl
+
+        short = "https://wa.me/+8801711111111?text=Hi"
+        long = "https://wa.me/+8801711111111?text=" + "%20" * 1000
+        df = pd.DataFrame({"Order": ["1", "2", "3"], "whatsapp_link": [short, long, None]})
+        ws = openpyxl.load_workbook(
+            BytesIO(to_excel_bytes(df, url_columns=["whatsapp_link"]))
+        ).active
+        assert ws["B2"].value == short
+        assert ws["B2"].hyperlink.target == short
+        assert ws["B3"].value == long
+        assert ws["B4"].value is None
+
+    def test_every_cell_survives_column_wise_writes(self):
+        df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"], "c": [0.5, None, 2.0]})
+        res = pd.read_excel(BytesIO(to_excel_bytes(df)))
+        assert res["b"].tolist() == ["x", "y", "z"]
+        assert res["a"].tolist() == [1, 2, 3]
+
+    def test_columns_sized_from_frame(self):
+        import openpyxl
+
+        df = pd.DataFrame({"Qty": [1], "Address": ["House 10, Road 4, Mirpur 12, Dhaka"]})
+        ws = openpyxl.load_workbook(BytesIO(to_excel_bytes(df))).active
+        assert ws.column_dimensions["B"].width > ws.column_dimensions["A"].width
+
+
+class TestStyleHeaderRow:
+    def test_one_format_shared_across_sheets(self):
+        import openpyxl
+
+        frames = {"A": pd.DataFrame({"Order ID": [1]}), "B": pd.DataFrame({"Phone": ["017"]})}
+        buf = BytesIO()
+        with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
+            header_format = writer.book.add_format(EXCEL_HEADER_STYLE)
+            for name, df in frames.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+                style_header_row(writer.sheets[name], df, header_format)
+        wb = openpyxl.load_workbook(BytesIO(buf.getvalue()))
+        assert wb["A"]["A1"].value == "Order ID"
+        assert wb["A"]["A1"].font.b and wb["B"]["A1"].font.b
+        assert wb["A"]["A1"].style_id == wb["B"]["A1"].style_id
+
+    def test_sizes_repeated_headers_by_position(self):
+        import openpyxl
+
+        df = pd.DataFrame([[1, "a much longer value"]], columns=["Qty", "Qty"])
+        buf = BytesIO()
+        with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
+            df.to_excel(writer, sheet_name="S", index=False)
+            style_header_row(writer.sheets["S"], df, writer.book.add_format(EXCEL_HEADER_STYLE))
+        ws = openpyxl.load_workbook(BytesIO(buf.getvalue()))["S"]
+        assert ws.column_dimensions["B"].width > ws.column_dimensions["A"].width
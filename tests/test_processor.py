@@ -103,3 +103,65 @@ def test_manual_item_input_is_normalized_sorted_and_aggregated():
         "3 FS Shirt = Oxford Shirt - SKU-2 (3 pcs); "
         "1 Polo Shirt = Polo Shirt; (4 items)"
     )
+
+
+def test_dedupe_address_parts_keeps_first_spelling():
+    parts = ["House 10,  Road 4", "", "dhaka", None, "Mirpur", "DHAKA", "nan", "mirpur "]
+
+    assert processor._dedupe_address_parts(parts) == ["House 10, Road 4", "dhaka", "Mirpur"]
+
+
+def test_pathao_city_zone_match_follows_reloaded_map(monkeypatch):
+    from functools import lru_cache
+
+    area = {"area_name": "Mirpur Sector 1"}
+    pathao_map = {"Dhaka": {"zones": {"Mirpur": {"areas": [area]}}}}
+    monkeypatch.setattr(processor, "_load_pathao_map", lru_cache(maxsize=1)(lambda: pathao_map))
+    processor.reload_pathao_map()
+    try:
+        assert processor._match_pathao_city_zone("", "mirpur", "") == ("Dhaka", "Mirpur", [area])
+        assert processor._match_pathao_city_zone("Dhaka", "Uttara", "") == ("Dhaka", "Uttara", [])
+
+        uttara = {"area_name": "Uttara Sector 4"}
+        pathao_map["Dhaka"]["zones"]["Uttara"] = {"areas": [uttara]}
+        processor.reload_pathao_map()
+        assert processor._match_pathao_city_zone("Dhaka", "Uttara", "") == ("Dhaka", "Uttara", [uttara])
+    finally:
+        monkeypatch.undo()
+        processor.reload_pathao_map()
+
+
+def test_payment_labels_for_marks_prepaid_orders():
+    df = pd.DataFrame(
+        {"Payment Method Title": ["bKash", "Pay Online", "SSL Commerz", "Cash on delivery", None]}
+    )
+
+    assert processor.payment_labels_for(df).tolist() == [
+        "Paid by Bkash",
+        "Paid by SSL",
+        "Paid by SSL",
+        "",
+        "",
+    ]
+    assert processor.payment_labels_for(df.drop(columns="Payment Method Title")).tolist() == [""] * 5
+
+
+def test_repeated_order_rows_counted_once_per_order():
+    df = pd.DataFrame(
+        {
+            "Order Number": ["O1", "O1", "O2", "O3"],
+            "Phone (Billing)": ["01711223344", "01711223344", "01711223344", "01811223344"],
+            "Item Name": ["Cap", "Polo Shirt - L", "Jeans - 32", "Cap"],
+            "Quantity": [1, 2, 1, 3],
+            "Order Total Amount": [500, 500, 300, 200],
+            "Payment Method Title": ["Cash on delivery", "Cash on delivery", "bKash", "Cash on delivery"],
+        }
+    )
+
+    res = processor.process_orders_dataframe(df).set_index("RecipientPhone(*)")
+
+    first = res.loc["01711223344"]
+    assert first["MerchantOrderId"] == "O1, O2"
+    assert first["AmountToCollect(*)"] == 500
+    assert first["ItemQuantity"] == 4
+    assert res.loc["01811223344", "ItemQuantity"] == 3
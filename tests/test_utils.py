@@ -1,9 +1,17 @@
+import re
 import pytest
+import urllib.parse
 import pandas as pd
 from src.utils.product import get_base_product_name, get_size_from_name
 from src.utils.text import normalize_city_name, peek_zone_from_address
 from src.processing.delivery_parser import parse_amount, is_consignment_id
-from src.processing.whatsapp_processor import WhatsAppOrderProcessor
+from src.processing.whatsapp_processor import (
+    WhatsAppOrderProcessor,
+    _item_lines,
+    encode_message,
+    encode_messages,
+    find_best_column,
+)
 
 
 class TestProductUtils:
@@ -29,6 +37,11 @@ class TestTextUtils:
         assert normalize_city_name("BD-60") == "Sylhet"
         assert normalize_city_name("BD-10") == "Chattogram"
 
+    def test_normalize_city_compact_iso_codes(self):
+        assert normalize_city_name("BD13") == "Dhaka"
+        assert normalize_city_name(" bd-64 ") == "Thakurgaon"
+        assert normalize_city_name("BD99") == "Bd99"
+
     def test_normalize_city_special_mappings(self):
         assert normalize_city_name("brahmanbaria") == "B. Baria"
         assert normalize_city_name("narsingdi") == "Narshingdi"
@@ -85,3 +98,249 @@ class TestWhatsAppProcessor:
         assert len(result_df) == 1
         assert result_df.iloc[0]["Order Total Amount"] == 2500
         assert "Shirt" in result_df.iloc[0]["Product Name (main)"]
+
+    def test_order_totals_sum_distinct_orders_per_phone(self):
+        processor = WhatsAppOrderProcessor()
+        df = pd.DataFrame(
+            {
+                "Phone (Billing)": ["01711111111"] * 3,
+                "Full Name (Billing)": ["John Doe"] * 3,
+                "Order ID": ["1001", "1001", "1002"],
+                "Product Name (main)": ["Shirt", "Pants", "Cap"],
+                "Quantity": [1, 2, 1],
+                "Item cost": [500, 1000, 300],
+                "Order Total Amount": [2500, 2500, 300],
+            }
+        )
+        result_df = processor.process_orders(df)
+        assert result_df.iloc[0]["Order Total Amount"] == 2800
+        assert result_df.iloc[0]["Order ID"] == "1001, 1002"
+
+    def test_find_best_column_prefers_exact_then_partial(self):
+        cols = ["Billing Phone Number", "Phone", "Customer Name"]
+        assert find_best_column(cols, ["phone", "mobile"]) == "Phone"
+        assert find_best_column(cols, ["mobile", "billing phone"]) == "Billing Phone Number"
+        assert find_best_column(cols, ["zip"], "Fallback") == "Fallback"
+
+    def test_find_best_column_partial_follows_key_priority(self):
+        cols = ["Order Notes", "Order # (Woo)", "Total Amount"]
+        assert find_best_column(cols, ["total", "order"]) == "Total Amount"
+        assert find_best_column(cols, ["order #", "notes"]) == "Order # (Woo)"
+
+    def test_clean_phone_numbers_matches_scalar_cleaner(self):
+        processor = WhatsAppOrderProcessor()
+        phones = pd.Series(["+880 1711-111111", "1711111111", "01811111111", "", None, 1711.0], dtype=object)
+        expected = [processor.clean_phone_number(p) for p in phones]
+        assert processor.clean_phone_numbers(phones).tolist() == expected
+
+    @pytest.mark.parametrize("dtype", ["string", "str", object])
+    def test_clean_phone_numbers_text_dtypes(self, dtype):
+        # read_options loads the phone column as "string"; NA must clean to "".
+        processor = WhatsAppOrderProcessor()
+        phones = pd.Series(
+            [
+                "01711-111111",
+                None,
+                "+880 1811 111111",
+                "",
+                "০১৯১১-১১১১১১",
+                "٠١٥١١\u00a0١١١١١١",
+                "０１６１１１１１１１１",
+            ],
+            dtype=dtype,
+        )
+        assert processor.clean_phone_numbers(phones).tolist() == [
+            "01711111111",
+            "",
+            "8801811111111",
+            "0",
+            "01911111111",
+            "01511111111",
+            "01611111111",
+        ]
+        assert processor.clean_phone_number("০১৯১১-১১১১১১") == "01911111111"
+
+    def test_clean_phone_number_drops_every_non_digit(self):
+        processor = WhatsAppOrderProcessor()
+        for raw in ["+880 1711-111111", "(017) 11\u2011111\u00a0111", "০১৭১১১১১১১১", "01711111111.0"]:
+            assert processor.clean_phone_number(raw) == processor.clean_phone_number(
+                re.sub(r"\D+", "", raw)
+            )
+        assert processor.clean_phone_number("(017) 11\u2011111\u00a0111") == "01711111111"
+
+    def test_whatsapp_numbers_do_not_double_country_code(self):
+        processor = WhatsAppOrderProcessor()
+        phones = pd.Series(["01711111111", "8801711111111", "017", None])
+        assert processor.whatsapp_numbers(phones).tolist() == [
+            "8801711111111",
+            "8801711111111",
+            "88017",
+            "88",
+        ]
+
+    @pytest.mark.parametrize(
+        "phone, number",
+        [
+            # Shorter than ten digits: only "88" is prefixed, nothing is trimmed
+            ("0", "880"),
+            ("01711", "8801711"),
+            ("017111111", "88017111111"),
+            # Ten or more digits: "880" plus the last ten, whatever the prefix
+            ("1711111111", "8801711111111"),
+            ("01711111111", "8801711111111"),
+            ("8801711111111", "8801711111111"),
+            ("+8801711111111", "8801711111111"),
+            ("008801711111111", "8801711111111"),
+        ],
+    )
+    def test_whatsapp_numbers_short_and_prefixed(self, phone, number):
+        processor = WhatsAppOrderProcessor()
+        assert processor.whatsapp_numbers(pd.Series([phone])).tolist() == [number]
+
+    def test_create_whatsapp_links_uses_whatsapp_numbers(self):
+        processor = WhatsAppOrderProcessor()
+        phones = ["01711", "8801811111111", "01911111111"]
+        df = pd.DataFrame(
+            {
+                "Phone (Billing)": phones,
+                "Full Name (Billing)": ["A", "B", "C"],
+                "Order ID": ["1", "2", "3"],
+                "Product Name (main)": ["Cap"] * 3,
+                "Quantity": ["1"] * 3,
+                "Item cost": ["100"] * 3,
+                "Order Total Amount": [100] * 3,
+            }
+        )
+        links = processor.create_whatsapp_links(df)["whatsapp_link"].tolist()
+        assert [link.split("?text=", 1)[0] for link in links] == [
+            "https://wa.me/+8801711",
+            "https://wa.me/+8801811111111",
+            "https://wa.me/+8801911111111",
+        ]
+
+    def test_format_text_series_matches_scalar_formatter(self):
+        processor = WhatsAppOrderProcessor()
+        values = pd.Series(["o'neil-smith", "road 12,  dhaka ,", None, "mirpur.dhaka", "o'neil-smith"], dtype=object)
+        expected = [processor.format_name(v) for v in values]
+        assert processor.format_text_series(values).tolist() == expected
+
+        distinct = values.iloc[:4].set_axis([7, 3, 9, 1])
+        result = processor.format_text_series(distinct)
+        assert result.index.tolist() == [7, 3, 9, 1]
+        assert result.tolist() == expected[:4]
+
+    def test_format_text_word_casing(self):
+        processor = WhatsAppOrderProcessor()
+        assert processor.format_text("md RAHIM uddin") == "Md Rahim Uddin"
+        assert processor.format_text("o'neil smith-jones") == "O'Neil Smith-Jones"
+        assert processor.format_text("house 4, sher-e-bangla nagar") == "House 4, Sher-E-Bangla Nagar"
+        assert processor.format_text("mirpur.dhaka") == "Mirpur. Dhaka"
+
+    def test_detect_gender_salutations_matches_scalar(self):
+        processor = WhatsAppOrderProcessor()
+        names = pd.Series(["Mst. Salma", "John Doe", "", None, "MRS.Khan"], dtype=object)
+        expected = [processor.detect_gender_salutation(n) for n in names]
+        assert processor.detect_gender_salutations(names).tolist() == expected
+
+    def test_format_address_series_matches_scalar(self):
+        processor = WhatsAppOrderProcessor()
+        address = pd.Series(["house 10, road 4", None, "  ", "x"], dtype=object)
+        city = pd.Series(["dhaka", "mirpur", None, None], dtype=object)
+        expected = [processor.format_address(a, c) for a, c in zip(address, city)]
+        assert processor.format_address_series(address, city).tolist() == expected
+
+    def test_format_address_series_preformatted_only_joins(self):
+        processor = WhatsAppOrderProcessor()
+        address = pd.Series(["House 10, road 4", None, "  ", "x"], dtype=object)
+        city = pd.Series(["dhaka", "Mirpur", None, None], dtype=object)
+        assert processor.format_address_series(address, city, preformatted=True).tolist() == [
+            "House 10, road 4\ndhaka",
+            "Mirpur",
+            "",
+            "x",
+        ]
+
+    def test_create_whatsapp_links_encodes_message(self):
+        processor = WhatsAppOrderProcessor()
+        df = pd.DataFrame(
+            {
+                "Phone (Billing)": ["01711111111", ""],
+                "Full Name (Billing)": ["Salma Begum", "Nobody"],
+                "Order ID": ["1001", "1002"],
+                "Product Name (main)": ["Shirt\n- Pants", "Cap"],
+                "Quantity": ["1\n- 2", "1"],
+                "Item cost": ["500\n- 1000", "100"],
+                "Order Total Amount": [2500, 100],
+                "Payment Method Title": ["bKash", None],
+            }
+        )
+        result = processor.create_whatsapp_links(df)
+
+        link = result.loc[0, "whatsapp_link"]
+        assert link.startswith("https://wa.me/+8801711111111?text=")
+        message = urllib.parse.unquote(link.split("?text=", 1)[1])
+        assert "Assalamu Alaikum, Madam!" in message
+        assert "- Pants - Qty: 2 - Price: 1000 BDT" in message
+        assert "*Total Amount:* 2500.00 BDT (PAID)" in message
+        assert result.loc[0, "order_summary"] == "Order 1001: Shirt, Pants | Total: 2500 BDT"
+        assert pd.isna(result.loc[1, "whatsapp_link"])
+
+    def test_encode_message_matches_quoting_whole_text(self):
+        template = "Hi {name}, order {order_id} & total: {total}\n{unknown}"
+        values = {"name": "Rahim Uddin", "order_id": "#12/3", "total": "100 BDT"}
+        expected = urllib.parse.quote(
+            "Hi Rahim Uddin, order #12/3 & total: 100 BDT\n{unknown}"
+        )
+        assert encode_message(template, values) == expected
+
+    def test_encode_messages_matches_per_message_encoding(self):
+        template = "Hi {name}, order {order_id}\n{name} / {total}"
+        values = {
+            "name": ["Rahim Uddin", "রহিম", "nul\x00name", "", "nul\x00name"],
+            "order_id": ["#12/3", "1002", "1003", "1004", "1005"],
+            "total": ["100 BDT", "50% off", "0", "x", "100 BDT"],
+        }
+        expected = [
+            encode_message(template, {key: col[i] for key, col in values.items()})
+            for i in range(5)
+        ]
+        assert encode_messages(template, values) == expected
+        assert encode_messages("static", values) == [urllib.parse.quote("static")] * 5
+
+    def test_item_lines_tolerate_short_quantity_and_price_lists(self):
+        products = ["Shirt ", "Pants", "Cap"]
+        assert _item_lines(products, ["1", " 2"], ["500"]) == (
+            "- Shirt - Qty: 1 - Price: 500 BDT\n- Pants - Qty: 2\n- Cap"
+        )
+        assert _item_lines(["Shirt"], ["1", "9"], ["500", "9"]) == "- Shirt - Qty: 1 - Price: 500 BDT"
+
+    def test_links_from_unjoined_items_match_joined(self):
+        processor = WhatsAppOrderProcessor()
+        df = pd.DataFrame(
+            {
+                "Phone (Billing)": ["01711111111", "01711111111"],
+                "Full Name (Billing)": ["John Doe", "John Doe"],
+                "Order ID": ["1001", "1001"],
+                "Product Name (main)": ["Shirt", "Pants"],
+                "Quantity": [1, 2],
+                "Item cost": [500, 1000],
+            }
+        )
+        joined = processor.create_whatsapp_links(processor.process_orders(df.copy()))
+        listed = processor.create_whatsapp_links(
+            processor.process_orders(df.copy(), join_items=False)
+        )
+        assert listed["whatsapp_link"].tolist() == joined["whatsapp_link"].tolist()
+        assert listed.loc[0, "Product Name (main)"] == "Shirt\n- Pants"
+
+    def test_read_options_limits_to_mapped_columns(self):
+        processor = WhatsAppOrderProcessor()
+        header = ["Phone (Billing)", "Full Name (Billing)", "Order ID", "Product Name (main)", "Notes"]
+        options = processor.read_options(header)
+        assert "Notes" not in options["usecols"]
+        assert options["dtype"] == {
+            "Phone (Billing)": "string",
+            "Order ID": "string",
+            "Full Name (Billing)": "string",
+            "Product Name (main)": "string",
+        }